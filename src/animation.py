@@ -0,0 +1,73 @@
+from time import perf_counter
+from tkinter import Misc
+from typing import Callable, Optional
+
+
+class Animation:
+    """
+    Chama `step(elapsed)` a cada quadro com o tempo real desde o quadro anterior, em segundos.
+    Quem anima avança pelo tempo decorrido, então um quadro lento só faz a animação pular posições
+    (quadros descartados) em vez de atrasar. Sempre há uma espera de pelo menos 1 ms entre quadros,
+    para o Tk conseguir processar a entrada do usuário.
+    """
+
+    # depois de uma pausa longa (ex.: a janela foi arrastada), não tenta compensar tudo de uma vez.
+    MAX_STEP = 0.25
+
+    root: Misc
+    target_fps: float
+    dropped_frames: int
+    _step: Callable[[float], None]
+    _running: bool
+    _pending: Optional[str]
+    _last_tick: float
+
+    def __init__(self, root: Misc, step: Callable[[float], None], target_fps: float = 25) -> None:
+        self.root = root
+        self.target_fps = target_fps
+        self.dropped_frames = 0
+        self._step = step
+        self._running = False
+        self._pending = None
+        self._last_tick = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    @property
+    def frame_time(self) -> float:
+        return 1 / self.target_fps
+
+    def start(self):
+        if self.running:
+            return
+
+        self._running = True
+        self.dropped_frames = 0
+        self._last_tick = perf_counter()
+        self._pending = self.root.after(int(self.frame_time * 1000), self.__tick)
+
+    def stop(self):
+        self._running = False
+        if self._pending is not None:
+            self.root.after_cancel(self._pending)
+            self._pending = None
+
+    def __tick(self):
+        self._pending = None
+        now = perf_counter()
+        elapsed = now - self._last_tick
+        self._last_tick = now
+
+        # cada intervalo inteiro a mais que passou é um quadro que não chegou a ser mostrado.
+        self.dropped_frames += max(int(elapsed / self.frame_time) - 1, 0)
+
+        self._step(min(elapsed, self.MAX_STEP))
+        if not self._running:
+            # step chamou stop().
+            return
+
+        # o próximo quadro é agendado para manter o intervalo alvo, descontando o tempo gasto aqui.
+        wait = self.frame_time - (perf_counter() - now)
+        self._pending = self.root.after(max(int(wait * 1000), 1), self.__tick)
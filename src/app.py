@@ -7,12 +7,14 @@ from typing import Callable
 
 import numpy as np
 
-from clipping import CohenSutherland, LiangBarsky
+from animation import Animation
+from clipping import CohenSutherland, LiangBarsky, SegmentClipper
 from descritor_obj import DescritorOBJ
 from display_file import DisplayFile
 from event import Events
-from interface import Viewport, Window
+from interface import RasterViewport, RenderWorker, Viewport, Window
 from projections import parallel_projection, perspective_projection
+from scheduler import FrameScheduler
 from shape import (
     BSpline,
     BSpline3D,
@@ -40,22 +42,32 @@ class App:
     display_file: DisplayFile
     root: Tk
     frame: ttk.Frame
+    viewport_frame: ttk.Frame
     selected_shape: Shape | None
     selected_shape_old_color: str
     shape_listbox: ShapeListbox
     movement_controls: MovementControls
     configuration: Configuration
-    animation_running: bool
+    animation: Animation
+    scheduler: FrameScheduler
+    render_worker: RenderWorker
 
     def redraw_viewport(func):
         @wraps(func)
         def wrapper(self: "App", *args, **kwargs):
             result = func(self, *args, **kwargs)
-            self.viewport.draw(self.window, self.display_file)
+            # o quadro é desenhado uma vez só no próximo ciclo ocioso, mesmo com vários eventos seguidos.
+            self.scheduler.max_fps = self.configuration.max_fps
+            self.scheduler.request()
             return result
 
         return wrapper
 
+    def render_frame(self):
+        # projeção e clipping rodam no RenderWorker. O canvas é atualizado quando o quadro fica pronto.
+        self.viewport.simplify_tolerance = self.configuration.simplify_tolerance
+        self.render_worker.submit(self.window, self.display_file)
+
     def bind_event(self, callback: Callable[[str | None], None], event: str, has_data: bool = True):
         if not has_data:
             self.root.bind(event, callback)
@@ -93,7 +105,11 @@ class App:
                 case "wireframe":
                     shape = Wireframe3D(lines, name, color)
                 case "curve3d":
-                    control_points = [(Vector3(*a)) for a in data["control_points"]]
+                    if data["control_points"] and isinstance(data["control_points"][0][0], list):
+                        # grade de uma superfície com vários patches.
+                        control_points = [[Vector3(*a) for a in line] for line in data["control_points"]]
+                    else:
+                        control_points = [(Vector3(*a)) for a in data["control_points"]]
                     shape = Curve3D(control_points, name, color, int(data["points_per_segment"]))
                 case "bspline3d":
                     control_points = [[Vector3(*a) for a in line] for line in data["control_points"]]
@@ -115,6 +131,8 @@ class App:
 
     @redraw_viewport
     def load_shapes(self, filename):
+        # um quadro da cena antiga ainda em andamento recriaria os itens dos shapes que são apagados aqui.
+        self.render_worker.cancel()
         self.display_file.all_dirty()
         self.viewport.clean(self.display_file)
         self.display_file, hex_color_names = DescritorOBJ.load(filename)
@@ -126,8 +144,26 @@ class App:
 
     @redraw_viewport
     def rotate_window(self, e):
-        if self.animation_running and e is not True:
+        if self.animation.running:
+            return
+
+        self.__rotate_window(self.configuration.rotation_rad)
+        if self.configuration.animate_window_rotation.get() == "on":
+            self.animation.start()
+
+    @redraw_viewport
+    def __animate_window_rotation(self, elapsed: float):
+        if self.configuration.animate_window_rotation.get() != "on":
+            self.animation.stop()
+            self.configuration.animation_fps = None
             return
+
+        # a rotação configurada é por quadro no FPS alvo. Ela é escalada pelo tempo que realmente passou.
+        self.__rotate_window(self.configuration.rotation_rad * elapsed / self.animation.frame_time)
+        # o FPS alcançado é o de quadros desenhados, que terminam no RenderWorker, e não o dos ticks.
+        self.configuration.animation_fps = (self.render_worker.fps, self.animation.target_fps)
+
+    def __rotate_window(self, angle: float):
         match self.configuration.window_rotation.get():
             case "horizontal":
                 axis = "X"
@@ -141,20 +177,13 @@ class App:
                 raise ValueError(f"Invalid window rotation. rotation: {self.configuration.window_rotation.get()}")
 
         if axis is not None:
-            self.window.rotate(self.configuration.rotation_rad, axis)
+            self.window.rotate(angle, axis)
         else:
             Transformer3D(self.window.points[:] + [self.window.vpn, self.window.vrp]).rotate(
-                self.configuration.rotation_rad, self.configuration.rotation_axis
+                angle, self.configuration.rotation_axis
             ).apply()
         self.display_file.all_dirty()
 
-        animate = self.configuration.animate_window_rotation.get() == "on"
-        if animate:
-            self.root.after(40, self.rotate_window, True)  # 40 ms --> 25 FPS
-            self.animation_running = True
-        elif self.animation_running:
-            self.animation_running = False
-
     @redraw_viewport
     def move_window(self, direction: str):
         self.window.move(direction, self.configuration.move_step)
@@ -199,12 +228,9 @@ class App:
         else:
             displacement_vector = [0, 0, -step]
 
-        # Apply the displacement_vector for window points
-        for i in range(len(self.selected_shape.points)):
-            self.selected_shape.points[i] += Vector3.from_array(displacement_vector)
-
-        center = self.selected_shape.transformer.center(self.selected_shape.points)
-        self.configuration.selected_shape_center = center
+        self.selected_shape.transform(Transformer3D().translation(Vector3.from_array(displacement_vector)))
+        self.display_file.moved(self.selected_shape)
+        self.configuration.selected_shape_center = self.selected_shape.center
 
     @redraw_viewport
     def scale(self, factor: str):
@@ -212,17 +238,17 @@ class App:
 
         step = self.configuration.scale_step if factor == "+" else 1 / self.configuration.scale_step
 
-        self.selected_shape.transformer.scale(step).apply()
-        center = self.selected_shape.transformer.center(self.selected_shape.points)
-        self.configuration.selected_shape_center = center
+        self.selected_shape.transform(Transformer3D().scale(step, self.selected_shape.center))
+        self.display_file.moved(self.selected_shape)
+        self.configuration.selected_shape_center = self.selected_shape.center
 
     @redraw_viewport
     def rotate(self, e):
         self.selected_shape.dirty = True
 
-        self.selected_shape.transformer.rotate(self.configuration.rotation_rad, self.configuration.rotation_axis).apply()
-        center = self.selected_shape.transformer.center(self.selected_shape.points)
-        self.configuration.selected_shape_center = center
+        self.selected_shape.transform(Transformer3D().rotate(self.configuration.rotation_rad, self.configuration.rotation_axis))
+        self.display_file.moved(self.selected_shape)
+        self.configuration.selected_shape_center = self.selected_shape.center
 
     @redraw_viewport
     def clear_selected_shape(self, e):
@@ -245,16 +271,19 @@ class App:
 
         self.configuration.move_window_or_shape.set("SHAPE")
         self.movement_controls.set_moving("SHAPE")
-        center = self.selected_shape.transformer.center(self.selected_shape.points)
-        self.configuration.selected_shape_center = center
+        self.configuration.selected_shape_center = self.selected_shape.center
 
     @redraw_viewport
     def change_line_clipping(self, alg: str):
         print(f"Mudando algoritmo de clipping para {alg}")
         if alg == "cohen":
-            Line.clipper = CohenSutherland
+            SegmentClipper.line_clipper = CohenSutherland
         else:
-            Line.clipper = LiangBarsky
+            SegmentClipper.line_clipper = LiangBarsky
+        self.display_file.all_dirty()
+
+    @redraw_viewport
+    def change_simplify_tolerance(self, e):
         self.display_file.all_dirty()
 
     @redraw_viewport
@@ -266,21 +295,37 @@ class App:
             self.viewport.projection = parallel_projection
         self.display_file.all_dirty()
 
-    def __create_viewport_and_log(self):
-        viewport_frame = ttk.Frame(self.frame, padding="12 -3 12 12")
-        viewport_frame.grid(column=6, row=0)
-
-        ttk.Label(viewport_frame, text="Viewport").grid(column=0, row=0, sticky="w")
+    @redraw_viewport
+    def change_backend(self, backend: str):
+        print(f"Mudando renderização para {backend}")
+        projection = self.viewport.projection
+        self.render_worker.cancel()
+        self.viewport.canvas.destroy()
+
+        self.__create_viewport(RasterViewport if backend == "raster" else Viewport)
+        self.viewport.projection = projection
+        self.render_worker.viewport = self.viewport
+        self.display_file.all_dirty()
 
-        self.viewport = Viewport(
+    def __create_viewport(self, viewport_type: type[Viewport]):
+        self.viewport = viewport_type(
             Vector3(0, 0),
             Vector3(VIEWPORT_DIMENSION[0], VIEWPORT_DIMENSION[1]),
-            viewport_frame,
+            self.viewport_frame,
             "#ffffff",
         )
 
         self.viewport.canvas.grid(column=0, row=1)
 
+    def __create_viewport_and_log(self):
+        self.viewport_frame = ttk.Frame(self.frame, padding="12 -3 12 12")
+        self.viewport_frame.grid(column=6, row=0)
+
+        ttk.Label(self.viewport_frame, text="Viewport").grid(column=0, row=0, sticky="w")
+
+        self.__create_viewport(Viewport)
+        self.render_worker = RenderWorker(self.root, self.viewport)
+
     def __create_left_menu(self):
         menu_frame = ttk.LabelFrame(self.frame, padding="12 -3 12 12", border=3, borderwidth=3, relief="groove", text="Function Menu")
         menu_frame.grid(column=0, row=0, sticky="NSEW", rowspan=20, columnspan=5)
@@ -318,6 +363,8 @@ class App:
         self.bind_event(self.load_shapes, Events.LOAD_SHAPES, True)
         self.bind_event(self.change_line_clipping, Events.CHANGE_CLIPPING_ALGORITHM, True)
         self.bind_event(self.change_projection, Events.CHANGE_PROJECTION, True)
+        self.bind_event(self.change_backend, Events.CHANGE_BACKEND, True)
+        self.bind_event(self.change_simplify_tolerance, Events.CHANGE_SIMPLIFY_TOLERANCE, False)
 
     def __init__(self):
         self.root = Tk()
@@ -336,7 +383,8 @@ class App:
         # self.frame.rowconfigure(0, weight=1)
         # self.frame.columnconfigure(0, weight=2)
         self.display_file = DisplayFile()
-        self.animation_running = False
+        self.animation = Animation(self.root, self.__animate_window_rotation, target_fps=25)
+        self.scheduler = FrameScheduler(self.root, self.render_frame)
 
         self.__create_left_menu()
         self.__create_viewport_and_log()
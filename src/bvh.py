@@ -0,0 +1,129 @@
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from shape import Shape
+
+if TYPE_CHECKING:
+    from projections import View
+
+
+class _Node:
+    low: npt.NDArray[np.float64]
+    high: npt.NDArray[np.float64]
+    parent: Optional["_Node"]
+    children: tuple["_Node", "_Node"] | None
+    shapes: list[Shape] | None
+
+    def __init__(self, parent: Optional["_Node"]) -> None:
+        self.parent = parent
+        self.children = None
+        self.shapes = None
+
+    def refit(self):
+        if self.shapes is not None:
+            boxes = [shape.bounding_box for shape in self.shapes]
+            self.low = np.min([low for low, _ in boxes], axis=0)
+            self.high = np.max([high for _, high in boxes], axis=0)
+        else:
+            left, right = self.children
+            self.low = np.minimum(left.low, right.low)
+            self.high = np.maximum(left.high, right.high)
+
+
+class BoundingVolumeHierarchy:
+    """
+    Árvore de AABBs dos shapes, para descartar de uma vez grupos inteiros fora do volume de visão.
+    """
+
+    LEAF_SIZE = 4
+
+    _shapes: list[Shape]
+    _root: Optional[_Node]
+    _leaves: dict[Shape, _Node]
+    _stale: bool
+
+    def __init__(self, shapes: Optional[list[Shape]] = None) -> None:
+        self._shapes = list(shapes or [])
+        self._root = None
+        self._leaves = {}
+        self._stale = True
+
+    def insert(self, shape: Shape):
+        # a árvore é reconstruída na próxima consulta, então vários inserts seguidos custam um build só.
+        self._shapes.append(shape)
+        self._stale = True
+
+    def update(self, shape: Shape):
+        """
+        Reajusta as caixas do caminho entre a folha do shape e a raiz depois que ele se moveu.
+        """
+
+        node = self._leaves.get(shape)
+        if self._stale or node is None:
+            self._stale = True
+            return
+
+        while node is not None:
+            node.refit()
+            node = node.parent
+
+    def query(self, view: "View") -> list[Shape]:
+        """
+        Shapes que `view.sees`. Um nó cuja caixa fica fora do volume de visão descarta a subárvore inteira;
+        na perspectiva isso depende de `View.sees_box` limitar o z a d, como `View.project`.
+        """
+
+        if self._stale:
+            self.__rebuild()
+
+        visible = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            if not view.sees_box(node.low, node.high):
+                continue
+
+            if node.shapes is not None:
+                visible.extend(shape for shape in node.shapes if view.sees(shape))
+            else:
+                stack.extend(node.children)
+
+        return visible
+
+    def __rebuild(self):
+        self._leaves = {}
+        self._stale = False
+
+        # shapes sem pontos nunca aparecem na window.
+        shapes = [shape for shape in self._shapes if len(shape.points)]
+        if not shapes:
+            self._root = None
+            return
+
+        boxes = np.array([shape.bounding_box for shape in shapes])
+        self._root = self.__build(shapes, boxes, None)
+
+    def __build(self, shapes: list[Shape], boxes: npt.NDArray[np.float64], parent: Optional[_Node]) -> _Node:
+        node = _Node(parent)
+        node.low = boxes[:, 0].min(axis=0)
+        node.high = boxes[:, 1].max(axis=0)
+
+        if len(shapes) <= self.LEAF_SIZE:
+            node.shapes = shapes
+            for shape in shapes:
+                self._leaves[shape] = node
+            return node
+
+        # divide pela mediana dos centros no eixo mais longo da caixa.
+        axis = int(np.argmax(node.high - node.low))
+        order = np.argsort(boxes[:, :, axis].sum(axis=1), kind="stable")
+        half = len(order) // 2
+        left, right = order[:half], order[half:]
+
+        node.children = (
+            self.__build([shapes[i] for i in left], boxes[left], node),
+            self.__build([shapes[i] for i in right], boxes[right], node),
+        )
+        return node
@@ -1,66 +1,138 @@
 from abc import ABC, abstractmethod
-from itertools import batched
+
+import numpy as np
+import numpy.typing as npt
 
 from vector3 import Vector3
 
 
+def _as_points(points: list) -> npt.NDArray[np.float64]:
+    return np.array(points, dtype=np.float64).reshape(-1, 2)
+
+
 class Clipper(ABC):
     @classmethod
     @abstractmethod
-    def clip(cls, points: list[Vector3], window_max: Vector3, window_min: Vector3) -> list[Vector3]: ...
+    def clip(cls, points: npt.NDArray[np.float64], window_max: Vector3, window_min: Vector3) -> npt.NDArray[np.float64]: ...
+
+    @classmethod
+    def clip_many(
+        cls, points_list: list[npt.NDArray[np.float64]], window_max: Vector3, window_min: Vector3
+    ) -> list[npt.NDArray[np.float64]]:
+        """
+        Recorta os pontos de vários shapes que usam este clipper.
+        """
+
+        return [cls.clip(points, window_max, window_min) for points in points_list]
+
+
+class LineClipper(Clipper):
+    """
+    Algoritmos de recorte de segmentos. Todos trabalham sobre arrays (M, 2, 2) de segmentos.
+    """
+
+    @classmethod
+    @abstractmethod
+    def clip_batch(
+        cls, segments: npt.NDArray[np.float64], window_max: Vector3, window_min: Vector3
+    ) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.bool_]]:
+        """
+        Recorta um array (M, 2, 2) de segmentos de uma vez.
+        Retorna os segmentos recortados e a máscara dos que sobreviveram.
+        """
+
+    @classmethod
+    def clip_segments(cls, segments: npt.NDArray[np.float64], window_max: Vector3, window_min: Vector3) -> npt.NDArray[np.float64]:
+        clipped, keep = cls.clip_batch(segments, window_max, window_min)
+        return clipped[keep]
+
+    @classmethod
+    def clip(cls, points: npt.NDArray[np.float64], window_max: Vector3, window_min: Vector3) -> npt.NDArray[np.float64]:
+        return cls.clip_segments(points[:, :2].reshape(-1, 2, 2), window_max, window_min).reshape(-1, 2)
 
 
 class PointClipper(Clipper):
     @classmethod
-    def clip(cls, points: list[Vector3], window_max: Vector3, window_min: Vector3) -> list[Vector3]:
-        x, y, _ = points[0]
-        return points if window_min.x <= x <= window_max.x and window_min.y <= y <= window_max.y else []
+    def clip(cls, points: npt.NDArray[np.float64], window_max: Vector3, window_min: Vector3) -> npt.NDArray[np.float64]:
+        x, y = points[0, :2]
+        return points[:, :2] if window_min.x <= x <= window_max.x and window_min.y <= y <= window_max.y else _as_points([])
 
 
-class LiangBarsky(Clipper):
+class LiangBarsky(LineClipper):
     @classmethod
-    def clip(cls, points: list[Vector3], window_max: Vector3, window_min: Vector3) -> list[Vector3]:
-        p_b, p_a = points
+    def clip_batch(
+        cls, segments: npt.NDArray[np.float64], window_max: Vector3, window_min: Vector3
+    ) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.bool_]]:
+        start = segments[:, 0]
+        delta = segments[:, 1] - start
+
+        pk = np.stack((-delta[:, 0], delta[:, 0], -delta[:, 1], delta[:, 1]), axis=1)
+        qk = np.stack(
+            (
+                start[:, 0] - window_min.x,
+                window_max.x - start[:, 0],
+                start[:, 1] - window_min.y,
+                window_max.y - start[:, 1],
+            ),
+            axis=1,
+        )
+
+        # p == 0: segmento paralelo à borda. Só é descartado se estiver do lado de fora (q < 0).
+        parallel = pk == 0
+        outside = np.any(parallel & (qk < 0), axis=1)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rk = qk / np.where(parallel, 1, pk)
+
+        c1 = np.max(np.where(pk < 0, rk, 0), axis=1)
+        c2 = np.min(np.where(pk > 0, rk, 1), axis=1)
 
-        p1 = -(p_a.x - p_b.x)
-        p2 = p_a.x - p_b.x
-        p3 = -(p_a.y - p_b.y)
-        p4 = p_a.y - p_b.y
-        pk = [p1, p2, p3, p4]
+        keep = ~outside & (c1 <= c2)
+        clipped = start[:, None] + np.stack((c1, c2), axis=1)[..., None] * delta[:, None]
 
-        q1 = p_b.x - window_min.x
-        q2 = window_max.x - p_b.x
-        q3 = p_b.y - window_min.y
-        q4 = window_max.y - p_b.y
-        qk = [q1, q2, q3, q4]
+        return clipped, keep
 
-        r1 = q1 / p1
-        r2 = q2 / p2
-        r3 = q3 / p3
-        r4 = q4 / p4
-        rk = [r1, r2, r3, r4]
 
-        if any(p == 0 and q < 0 for p, q in zip(pk, qk)):
-            return []
+class CohenSutherland(LineClipper):
+    @classmethod
+    def outcodes(cls, points: npt.NDArray[np.float64], window_max: Vector3, window_min: Vector3) -> npt.NDArray[np.int_]:
+        """
+        Region codes de todos os pontos (N, 2) de uma vez. Mesmos bits de `__get_rc`.
+        """
+
+        x = points[..., 0]
+        y = points[..., 1]
 
-        pk_up = [i for i in range(len(pk)) if pk[i] > 0]
-        pk_down = [i for i in range(len(pk)) if pk[i] < 0]
+        return (
+            (x < window_min.x) * (1 << 0)
+            | (x > window_max.x) * (1 << 1)
+            | (y < window_min.y) * (1 << 2)
+            | (y > window_max.y) * (1 << 3)
+        )
 
-        c1 = max([rk[i] for i in pk_down] + [0])
-        c2 = min([rk[i] for i in pk_up] + [1])
+    @classmethod
+    def clip_batch(
+        cls, segments: npt.NDArray[np.float64], window_max: Vector3, window_min: Vector3
+    ) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.bool_]]:
+        codes = cls.outcodes(segments, window_max, window_min)
+        rc1, rc2 = codes[:, 0], codes[:, 1]
 
-        if c1 > c2:
-            return []
+        # dentro: aceitos como estão. totalmente fora: descartados.
+        keep = (rc1 | rc2) == 0
+        clipped = segments[:, :, :2].copy()
 
-        x1 = p_b.x + c1 * p2
-        y1 = p_b.y + c1 * p4
-        x2 = p_b.x + c2 * p2
-        y2 = p_b.y + c2 * p4
+        # só os segmentos parcialmente dentro passam pelo cálculo das interseções.
+        for i in np.flatnonzero(((rc1 & rc2) == 0) & ~keep):
+            line = cls.__clip_segment(segments[i], window_max, window_min)
+            if not len(line):
+                continue
 
-        return [Vector3(x1, y1), Vector3(x2, y2)]
+            # __clip_segment ordena os pontos por x. Mantém a orientação original do segmento.
+            clipped[i] = line if segments[i, 0, 0] <= segments[i, 1, 0] else line[::-1]
+            keep[i] = True
 
+        return clipped, keep
 
-class CohenSutherland(Clipper):
     @classmethod
     def __get_rc(cls, x: float, y: float, xw_min: float, xw_max: float, yw_min: float, yw_max: float) -> int:
         rc = 0
@@ -77,16 +149,15 @@ class CohenSutherland(Clipper):
         return rc
 
     @classmethod
-    def clip(cls, points: list[Vector3], window_max: Vector3, window_min: Vector3) -> list[Vector3]:
+    def __clip_segment(cls, points: npt.NDArray[np.float64], window_max: Vector3, window_min: Vector3) -> npt.NDArray[np.float64]:
         xw_min = window_min.x
         xw_max = window_max.x
 
         yw_min = window_min.y
         yw_max = window_max.y
 
-        p1, p2 = points
-        x1, y1, _ = p1
-        x2, y2, _ = p2
+        x1, y1 = points[0, :2]
+        x2, y2 = points[1, :2]
 
         if x1 > x2:
             x1, y1, x2, y2 = x2, y2, x1, y1
@@ -96,16 +167,16 @@ class CohenSutherland(Clipper):
 
         # dentro
         if rc1 == rc2 == 0:
-            return [Vector3(x1, y1), Vector3(x2, y2)]
+            return _as_points([(x1, y1), (x2, y2)])
 
         # totalmente fora
         if (rc1 & rc2) != 0:
-            return []
+            return _as_points([])
 
         # parcialmente dentro
         if abs(x2 - x1) < 1e-6:
             if not (xw_min <= x1 <= xw_max):
-                return []
+                return _as_points([])
 
             if y1 <= y2:
                 y1 = max(y1, yw_min)
@@ -113,7 +184,7 @@ class CohenSutherland(Clipper):
             else:
                 y2 = max(y2, yw_min)
                 y1 = min(y1, yw_max)
-            return [Vector3(x1, y1), Vector3(x2, y2)]
+            return _as_points([(x1, y1), (x2, y2)])
 
         m = (y2 - y1) / (x2 - x1)
 
@@ -129,7 +200,7 @@ class CohenSutherland(Clipper):
             x_inside = xw_min <= x1 <= xw_max
             y_inside = yw_min <= y1 <= yw_max
             if not (x_inside or y_inside):
-                return []
+                return _as_points([])
 
             if not x_inside:
                 x1 = xw_min
@@ -140,7 +211,7 @@ class CohenSutherland(Clipper):
             y1 = m * (xw_min - x1) + y1
 
             if not (yw_min <= y1 <= yw_max):
-                return []
+                return _as_points([])
             x1 = xw_min
         # p1 no canto inferior esquerdo
         elif rc1 == 0b0101:
@@ -151,7 +222,7 @@ class CohenSutherland(Clipper):
             x_inside = xw_min <= x1 <= xw_max
             y_inside = yw_min <= y1 <= yw_max
             if not (x_inside or y_inside):
-                return []
+                return _as_points([])
 
             if not x_inside:
                 x1 = xw_min
@@ -162,7 +233,7 @@ class CohenSutherland(Clipper):
             x1 = x1 + 1 / m * (yw_max - y1)
 
             if not (xw_min <= x1 <= xw_max):
-                return []
+                return _as_points([])
 
             y1 = yw_max
         # p1 no fundo
@@ -170,21 +241,21 @@ class CohenSutherland(Clipper):
             x1 = x1 + 1 / m * (yw_min - y1)
 
             if not (xw_min <= x1 <= xw_max):
-                return []
+                return _as_points([])
             y1 = yw_min
         # p2 no topo
         if rc2 == 0b1000:
             x2 = x2 + 1 / m * (yw_max - y2)
 
             if not (xw_min <= x2 <= xw_max):
-                return []
+                return _as_points([])
             y2 = yw_max
         # p2 no fundo
         elif rc2 == 0b0100:
             x2 = x2 + 1 / m * (yw_min - y2)
 
             if not (xw_min <= x2 <= xw_max):
-                return []
+                return _as_points([])
             y2 = yw_min
         # p2 no canto superior direito
         elif rc2 == 0b1010:
@@ -194,7 +265,7 @@ class CohenSutherland(Clipper):
             x_inside = xw_min <= x2 <= xw_max
             y_inside = yw_min <= y2 <= yw_max
             if not (x_inside or y_inside):
-                return []
+                return _as_points([])
 
             if not x_inside:
                 x2 = xw_max
@@ -205,7 +276,7 @@ class CohenSutherland(Clipper):
             y2 = m * (xw_max - x2) + y2
 
             if not (yw_min <= y2 <= yw_max):
-                return []
+                return _as_points([])
 
             x2 = xw_max
         # p2 no canto inferior esquerdo
@@ -216,100 +287,86 @@ class CohenSutherland(Clipper):
             x_inside = xw_min <= x2 <= xw_max
             y_inside = yw_min <= y2 <= yw_max
             if not (x_inside or y_inside):
-                return []
+                return _as_points([])
 
             if not x_inside:
                 x2 = xw_max
             if not y_inside:
                 y2 = yw_min
-        return [Vector3(x1, y1), Vector3(x2, y2)]
+        return _as_points([(x1, y1), (x2, y2)])
 
 
 class SutherlandHodgman(Clipper):
     @classmethod
-    def clip(cls, points: list[Vector3], window_max: Vector3, window_min: Vector3) -> list[Vector3]:
-        points_list = []
-        extra_points = 0
-        for p1, p2 in batched(points, 2):
-            p = p1
-            q = p2
-            # print(f"P: {p}, Q: {q}")
-
-            p_inside = (window_min.x <= p.x <= window_max.x) and (window_min.y <= p.y <= window_max.y)
-            q_inside = (window_min.x <= q.x <= window_max.x) and (window_min.y <= q.y <= window_max.y)
-
-            if p_inside and q_inside:
-                # print("P e Q dentro")
-                points_list.append(p)
-                points_list.append(q)
-            elif p_inside and not q_inside:
-                # print("P dentro e Q fora")
-                intersect = LiangBarsky.clip([p, q], window_max, window_min)
-                points_list.append(p)
-                points_list.append(intersect[1])
-            elif not p_inside and q_inside:
-                # print("P fora e Q dentro")
-                intersect = LiangBarsky.clip([p, q], window_max, window_min)
-                if intersect[0] == q:
-                    points_list.append(intersect[1])
-                else:
-                    points_list.append(intersect[0])
-                points_list.append(q)
-            elif not p_inside and not q_inside:
-                # print("P e Q fora")
-                intersect = LiangBarsky.clip([p, q], window_max, window_min)
-                if len(intersect) > 0:
-                    points_list.append(intersect[0])
-                    points_list.append(intersect[1])
-                """else:
-                    # q não foi inserido, logo não há seguimento entre q e o póximo ponto.
-                    # polygon.ppc_inexistent_lines.add(
-                    #     (i % len(polygon.ppc_points), (i + 1) % len(polygon.ppc_points))
-                    # )
-                    if (p.x < window_min.x and q.y < window_min.y) or (q.x < window_min.x and p.y < window_min.y):
-                        points_list.append(Vector3(window_min.x, window_min.y, 1))
-                        extra_points += 1
-                    if (p.x < window_min.x and q.y > window_max.y) or (q.x < window_min.x and p.y > window_max.y):
-                        points_list.append(Vector3(window_min.x, window_max.y, 1))
-                        extra_points += 1
-                    if (p.x > window_max.x and q.y > window_max.y) or (q.x > window_max.x and p.y > window_max.y):
-                        points_list.append(Vector3(window_max.x, window_max.y, 1))
-                        extra_points += 1
-                    if (p.x > window_max.x and q.y < window_min.y) or (q.x > window_max.x and p.y < window_min.y):
-                        points_list.append(Vector3(window_max.x, window_min.y, 1))
-                        extra_points += 1
-                    """
-        if extra_points == len(points_list):
-            points_list = []
-        # print(f"OUTPUT: {points_list}")
-
-        return points_list
+    def __clip_edge(cls, polygon: npt.NDArray[np.float64], axis: int, limit: float, side: int) -> npt.NDArray[np.float64]:
+        """
+        Recorta o polígono contra uma borda da window. `side` é 1 quando o lado de dentro
+        fica acima de `limit` e -1 quando fica abaixo.
+        """
 
+        previous = np.roll(polygon, 1, axis=0)
+
+        current_distance = (polygon[:, axis] - limit) * side
+        previous_distance = (previous[:, axis] - limit) * side
+
+        current_inside = current_distance >= 0
+        crossing = current_inside != (previous_distance >= 0)
+
+        t = previous_distance / np.where(crossing, previous_distance - current_distance, 1)
+        intersection = previous + t[:, None] * (polygon - previous)
+
+        # Para cada aresta (anterior -> atual): a interseção, se a aresta cruza a borda,
+        # seguida do vértice atual, se ele está dentro.
+        candidates = np.stack((intersection, polygon), axis=1)
+        return candidates[np.stack((crossing, current_inside), axis=1)]
 
-class BezierClipper(Clipper):
     @classmethod
-    def clip(cls, points: list[Vector3], window_max: Vector3, window_min: Vector3) -> list[Vector3]:
-        returned_points = []
-        for i in range(len(points) - 1):
-            p1, p2 = points[i], points[i + 1]
+    def clip(cls, points: npt.NDArray[np.float64], window_max: Vector3, window_min: Vector3) -> npt.NDArray[np.float64]:
+        polygon = points[:, :2]
+
+        for axis, limit, side in (
+            (0, window_min.x, 1),
+            (0, window_max.x, -1),
+            (1, window_min.y, 1),
+            (1, window_max.y, -1),
+        ):
+            if not len(polygon):
+                break
+            polygon = cls.__clip_edge(polygon, axis, limit, side)
+
+        return polygon
 
-            line = LiangBarsky.clip([p1, p2], window_max, window_min)
-            if len(line):
-                returned_points.append(line[0])
 
-        line = LiangBarsky.clip([points[-2], points[-1]], window_max, window_min)
-        if len(line):
-            returned_points.append(line[1])
-        return returned_points
+class SegmentClipper(Clipper):
+    """
+    Recorta shapes formados por pares de pontos (linhas, wireframes 3D e superfícies)
+    com o algoritmo de recorte de linhas selecionado.
+    """
 
-class Bezier3DClipper(Clipper):
+    line_clipper: type[LineClipper] = CohenSutherland
+
+    @classmethod
+    def clip(cls, points: npt.NDArray[np.float64], window_max: Vector3, window_min: Vector3) -> npt.NDArray[np.float64]:
+        return cls.clip_many([points], window_max, window_min)[0]
+
+    @classmethod
+    def clip_many(
+        cls, points_list: list[npt.NDArray[np.float64]], window_max: Vector3, window_min: Vector3
+    ) -> list[npt.NDArray[np.float64]]:
+        # Os segmentos de todos os shapes são recortados em uma única chamada e depois separados por shape.
+        segments = [points[: len(points) // 2 * 2, :2].reshape(-1, 2, 2) for points in points_list]
+        counts = [len(s) for s in segments]
+
+        clipped, keep = cls.line_clipper.clip_batch(np.concatenate(segments), window_max, window_min)
+        owner = np.repeat(np.arange(len(segments)), counts)
+        survivors = np.bincount(owner[keep], minlength=len(segments))
+
+        return [s.reshape(-1, 2) for s in np.split(clipped[keep], np.cumsum(survivors)[:-1])]
+
+
+class BezierClipper(Clipper):
     @classmethod
-    def clip(cls, points: list[Vector3], window_max: Vector3, window_min: Vector3) -> list[Vector3]:
-        returned_points = []
-        for p1, p2 in batched(points, 2):
-            line = LiangBarsky.clip([p1, p2], window_max, window_min)
-            if len(line) > 0:
-                returned_points.append(line[0])
-                returned_points.append(line[1])
-
-        return returned_points
\ No newline at end of file
+    def clip(cls, points: npt.NDArray[np.float64], window_max: Vector3, window_min: Vector3) -> npt.NDArray[np.float64]:
+        # cada par de pontos consecutivos da curva é um segmento. A saída são os pares recortados.
+        segments = np.stack((points[:-1, :2], points[1:, :2]), axis=1)
+        return SegmentClipper.line_clipper.clip_segments(segments, window_max, window_min).reshape(-1, 2)
@@ -191,8 +191,11 @@ class DescritorOBJ:
                 rgb_color = [str(color) for color in cls.hex_to_rgb(color_hex)]
                 file.write(f"Kd {' '.join(rgb_color)}\n\n")
 
+        for shape in display_file:
+            shape.bake()
+
         with open(path, "w") as file:
-            all_points = [shape.points for shape in display_file]
+            all_points = [shape.vectors for shape in display_file]
             all_points: list[Vector3] = sorted(chain.from_iterable(all_points))
 
             points_idx: dict[Vector3, int] = {}
@@ -209,7 +212,7 @@ class DescritorOBJ:
                 file.write(f"o {shape.name}\n")
                 file.write(f"usemtl {hex_color_name[shape.color]}\n")
 
-                indices = [points_idx[point] for point in shape.points]
+                indices = [points_idx[point] for point in shape.vectors]
                 indices = " ".join([str(idx) for idx in indices])
                 match shape.shape_name:
                     case "Point":
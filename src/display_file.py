@@ -1,14 +1,19 @@
 from tkinter import StringVar
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
+from bvh import BoundingVolumeHierarchy
 from shape import Shape
 
+if TYPE_CHECKING:
+    from projections import View
+
 
 class DisplayFile:
     _shapes: list[Shape]
     _shapes_dict: dict[str, Shape]
+    _index: Optional[BoundingVolumeHierarchy]
 
-    def __init__(self, shapes: Optional[list[Shape]] = None) -> None:
+    def __init__(self, shapes: Optional[list[Shape]] = None, indexed: bool = True) -> None:
         if shapes is None:
             shapes = []
             shapes_dict = {}
@@ -17,10 +22,31 @@ class DisplayFile:
 
         self._shapes = shapes
         self._shapes_dict = shapes_dict
+        self._index = BoundingVolumeHierarchy(shapes) if indexed else None
 
     def append(self, shape: Shape):
         self._shapes.append(shape)
         self._shapes_dict[str(shape)] = shape
+        if self._index is not None:
+            self._index.insert(shape)
+
+    def moved(self, shape: Shape):
+        """
+        Deve ser chamado quando a geometria ou a model_matrix de um shape mudam.
+        """
+
+        if self._index is not None:
+            self._index.update(shape)
+
+    def visible(self, view: "View") -> list[Shape]:
+        """
+        Shapes cujo volume envolvente intersecta o volume de visão.
+        """
+
+        if self._index is not None:
+            return self._index.query(view)
+
+        return [shape for shape in self._shapes if view.sees(shape)]
 
     def get_shape_by_id(self, shape_id: str) -> Optional[Shape]:
         return self._shapes_dict.get(shape_id)
@@ -14,3 +14,5 @@ class Events:
     CHANGE_MOVE = "<<ChangeMove>>"
     CHANGE_WINDOW_ROTATION = "<<ChangeWindowRotation>>"
     CHANGE_PROJECTION = "<<ChangeProjecion>>"
+    CHANGE_BACKEND = "<<ChangeBackend>>"
+    CHANGE_SIMPLIFY_TOLERANCE = "<<ChangeSimplifyTolerance>>"
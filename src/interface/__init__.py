@@ -1,4 +1,7 @@
 from .viewport import Viewport
+from .headless import HeadlessViewport
+from .raster_viewport import RasterViewport
+from .render_worker import RenderWorker
 from .window import Window
 
-__all__ = ["Window", "Viewport"]
+__all__ = ["Window", "Viewport", "RasterViewport", "HeadlessViewport", "RenderWorker"]
@@ -0,0 +1,152 @@
+from typing import Callable, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+
+class Framebuffer:
+    """
+    Canvas em memória: uma imagem RGB em NumPy com os mesmos create_* do Canvas usados por `Shape.draw`.
+    """
+
+    NAMED_COLORS: dict[str, tuple[int, int, int]] = {
+        "black": (0, 0, 0),
+        "white": (255, 255, 255),
+        "red": (255, 0, 0),
+        "green": (0, 255, 0),
+        "blue": (0, 0, 255),
+        "gold": (255, 215, 0),
+        "gray": (128, 128, 128),
+    }
+
+    pixels: npt.NDArray[np.uint8]
+    background: tuple[int, int, int]
+    _colors: dict[str, tuple[int, int, int]]
+    _lookup_color: Optional[Callable[[str], tuple[int, int, int]]]
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        background: str = "#ffffff",
+        lookup_color: Optional[Callable[[str], tuple[int, int, int]]] = None,
+    ) -> None:
+        self._colors = {}
+        # usado para cores que não são hexadecimais nem estão em NAMED_COLORS (ex.: nomes de cor do Tk).
+        self._lookup_color = lookup_color
+        self.pixels = np.empty((height, width, 3), dtype=np.uint8)
+        self.background = self.rgb(background)
+        self.clear()
+
+    @property
+    def width(self) -> int:
+        return self.pixels.shape[1]
+
+    @property
+    def height(self) -> int:
+        return self.pixels.shape[0]
+
+    def clear(self):
+        self.pixels[:] = self.background
+
+    def rgb(self, color: str) -> tuple[int, int, int]:
+        if color not in self._colors:
+            if color.startswith("#") and len(color) == 7:
+                value = int(color[1:], 16)
+                self._colors[color] = ((value >> 16) & 0xFF, (value >> 8) & 0xFF, value & 0xFF)
+            elif color.lower() in self.NAMED_COLORS:
+                self._colors[color] = self.NAMED_COLORS[color.lower()]
+            elif self._lookup_color is not None:
+                self._colors[color] = self._lookup_color(color)
+            else:
+                raise ValueError(f"Cor desconhecida: {color}")
+
+        return self._colors[color]
+
+    def to_ppm(self) -> bytes:
+        return b"P6 %d %d 255\n" % (self.width, self.height) + self.pixels.tobytes()
+
+    def create_line(self, *coords, width: float = 1, fill: str = "black", **_) -> None:
+        points = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        self.draw_segments(points[:-1], points[1:], self.rgb(fill), int(width))
+
+    def create_oval(self, x1, y1, x2, y2, fill: str = "", outline: str = "black", **_) -> None:
+        # os ovais do programa são os pontos, com poucos pixels de raio: são pintados cheios.
+        cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+        rx, ry = max(abs(x2 - x1) / 2, 0.5), max(abs(y2 - y1) / 2, 0.5)
+
+        ys, xs = self.__grid(min(y1, y2), max(y1, y2), min(x1, x2), max(x1, x2))
+        inside = ((xs - cx) / rx) ** 2 + ((ys - cy) / ry) ** 2 <= 1
+        self.pixels[ys[inside], xs[inside]] = self.rgb(fill or outline)
+
+    def create_polygon(self, *coords, fill: str = "black", **_) -> None:
+        """
+        Preenchimento por scanline com a regra par-ímpar, todas as linhas de uma vez.
+        """
+
+        points = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        if len(points) < 3:
+            return
+
+        y_min = max(int(np.ceil(points[:, 1].min())), 0)
+        y_max = min(int(np.floor(points[:, 1].max())), self.height - 1)
+        if y_min > y_max:
+            return
+
+        start, end = points, np.roll(points, -1, axis=0)
+        rows = np.arange(y_min, y_max + 1, dtype=np.float64)[:, None] + 0.5
+
+        # (linhas, arestas): a aresta cruza a linha se ela está entre os seus y (meio-aberto, para não contar vértices duas vezes).
+        low, high = np.minimum(start[:, 1], end[:, 1]), np.maximum(start[:, 1], end[:, 1])
+        crosses = (rows >= low) & (rows < high)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x = start[:, 0] + (rows - start[:, 1]) * (end[:, 0] - start[:, 0]) / (end[:, 1] - start[:, 1])
+
+        row, edge = np.nonzero(crosses)
+        columns = np.clip(np.ceil(x[row, edge] - 0.5).astype(np.int64), 0, self.width)
+
+        # cada cruzamento inverte o estado dentro/fora a partir da sua coluna.
+        toggles = np.zeros((len(rows), self.width + 1), dtype=np.int32)
+        np.add.at(toggles, (row, columns), 1)
+        inside = np.cumsum(toggles, axis=1)[:, : self.width] % 2 == 1
+
+        self.pixels[y_min : y_max + 1][inside] = self.rgb(fill)
+
+    def draw_segments(
+        self,
+        starts: npt.NDArray[np.float64],
+        ends: npt.NDArray[np.float64],
+        color: tuple[int, int, int],
+        width: int = 1,
+    ):
+        """
+        DDA vetorizado: todos os pixels de todos os segmentos são gerados num único array.
+        """
+
+        if not len(starts):
+            return
+
+        delta = ends - starts
+        steps = np.ceil(np.abs(delta).max(axis=1)).astype(np.int64) + 1
+
+        segment = np.repeat(np.arange(len(starts)), steps)
+        first = np.repeat(np.cumsum(steps) - steps, steps)
+        t = (np.arange(len(segment)) - first) / np.maximum(steps[segment] - 1, 1)
+
+        xy = np.rint(starts[segment] + t[:, None] * delta[segment]).astype(np.int64)
+
+        if width > 1:
+            radius = width // 2
+            offsets = np.arange(-radius, radius + 1)
+            offsets = np.stack(np.meshgrid(offsets, offsets), axis=-1).reshape(-1, 2)
+            xy = (xy[:, None] + offsets).reshape(-1, 2)
+
+        inside = (xy[:, 0] >= 0) & (xy[:, 0] < self.width) & (xy[:, 1] >= 0) & (xy[:, 1] < self.height)
+        xy = xy[inside]
+        self.pixels[xy[:, 1], xy[:, 0]] = color
+
+    def __grid(self, y_min: float, y_max: float, x_min: float, x_max: float) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+        ys = np.arange(max(int(np.floor(y_min)), 0), min(int(np.ceil(y_max)), self.height - 1) + 1)
+        xs = np.arange(max(int(np.floor(x_min)), 0), min(int(np.ceil(x_max)), self.width - 1) + 1)
+        ys, xs = np.meshgrid(ys, xs, indexing="ij")
+        return ys.ravel(), xs.ravel()
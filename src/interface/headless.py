@@ -0,0 +1,153 @@
+from typing import Optional
+from xml.sax.saxutils import escape
+
+from interface.framebuffer import Framebuffer
+from interface.viewport import Viewport
+from vector3 import Vector3
+
+
+class HeadlessCanvas:
+    """
+    Guarda os itens desenhados em memória, com a parte da interface do Canvas que o Viewport usa.
+    Não precisa de display, e os itens podem ser exportados como SVG ou rasterizados num Framebuffer.
+    """
+
+    width: int
+    height: int
+    background: str
+    _items: dict[int, tuple[str, list[float], dict]]
+    _next_id: int
+
+    def __init__(self, width: int, height: int, background: str = "#ffffff") -> None:
+        self.width = width
+        self.height = height
+        self.background = background
+        self._items = {}
+        self._next_id = 1
+
+    def __create(self, kind: str, coords: tuple, options: dict) -> int:
+        item = self._next_id
+        self._next_id += 1
+        self._items[item] = (kind, [float(c) for c in coords], options)
+        return item
+
+    def create_line(self, *coords, **options) -> int:
+        return self.__create("line", coords, options)
+
+    def create_oval(self, *coords, **options) -> int:
+        return self.__create("oval", coords, options)
+
+    def create_polygon(self, *coords, **options) -> int:
+        return self.__create("polygon", coords, options)
+
+    def create_rectangle(self, *coords, **options) -> int:
+        return self.__create("rectangle", coords, options)
+
+    def coords(self, item: int, *coords):
+        kind, _, options = self._items[item]
+        self._items[item] = (kind, [float(c) for c in coords], options)
+
+    def itemconfigure(self, item: int, **options):
+        kind, coords, old_options = self._items[item]
+        self._items[item] = (kind, coords, old_options | options)
+
+    def delete(self, tag_or_id: int | str):
+        """
+        Aceita um id, uma tag ou "all", como o Canvas.
+        """
+
+        if tag_or_id == "all":
+            self._items.clear()
+        elif tag_or_id in self._items:
+            del self._items[tag_or_id]
+        else:
+            for item in [item for item, (_, _, options) in self._items.items() if options.get("tags") == tag_or_id]:
+                del self._items[item]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def rasterize(self, framebuffer: Optional[Framebuffer] = None) -> Framebuffer:
+        if framebuffer is None:
+            framebuffer = Framebuffer(self.width, self.height, self.background)
+        else:
+            framebuffer.clear()
+
+        for kind, coords, options in self._items.values():
+            if kind == "rectangle":
+                x1, y1, x2, y2 = coords
+                framebuffer.create_line(x1, y1, x2, y1, x2, y2, x1, y2, x1, y1, fill=options.get("outline", "black"))
+            else:
+                getattr(framebuffer, f"create_{kind}")(*coords, **options)
+
+        return framebuffer
+
+    def to_svg(self) -> str:
+        elements = [
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{self.width}" height="{self.height}">',
+            f'<rect width="100%" height="100%" fill="{escape(self.background)}"/>',
+        ]
+
+        for kind, coords, options in self._items.values():
+            points = " ".join(f"{x:.2f},{y:.2f}" for x, y in zip(coords[0::2], coords[1::2]))
+            match kind:
+                case "line":
+                    stroke = escape(options.get("fill", "black"))
+                    width = options.get("width", 1)
+                    elements.append(f'<polyline points="{points}" fill="none" stroke="{stroke}" stroke-width="{width}"/>')
+                case "polygon":
+                    elements.append(f'<polygon points="{points}" fill="{escape(options.get("fill", "black"))}"/>')
+                case "oval":
+                    x1, y1, x2, y2 = coords
+                    fill = escape(options.get("fill") or "none")
+                    stroke = escape(options.get("outline", "black"))
+                    elements.append(
+                        f'<ellipse cx="{(x1 + x2) / 2:.2f}" cy="{(y1 + y2) / 2:.2f}" rx="{abs(x2 - x1) / 2:.2f}" '
+                        f'ry="{abs(y2 - y1) / 2:.2f}" fill="{fill}" stroke="{stroke}"/>'
+                    )
+                case "rectangle":
+                    x1, y1, x2, y2 = coords
+                    stroke = escape(options.get("outline", "black"))
+                    elements.append(
+                        f'<rect x="{min(x1, x2):.2f}" y="{min(y1, y2):.2f}" width="{abs(x2 - x1):.2f}" '
+                        f'height="{abs(y2 - y1):.2f}" fill="none" stroke="{stroke}"/>'
+                    )
+
+        elements.append("</svg>")
+        return "\n".join(elements)
+
+
+class HeadlessViewport(Viewport):
+    """
+    Viewport sem Tk: roda o mesmo pipeline do `Viewport.draw` e desenha num HeadlessCanvas.
+    """
+
+    _canvas: HeadlessCanvas
+
+    def __init__(self, min_vec: Vector3, max_vec: Vector3, background_color: str = "#ffffff"):
+        super().__init__(min_vec, max_vec, None, background_color)
+
+    def _create_canvas(self, parent: None, background_color: str) -> HeadlessCanvas:
+        canvas_size = self._max - self._min
+        return HeadlessCanvas(int(canvas_size.x), int(canvas_size.y), background_color)
+
+    @property
+    def canvas(self) -> HeadlessCanvas:
+        return self._canvas
+
+    def framebuffer(self, framebuffer: Optional[Framebuffer] = None) -> Framebuffer:
+        return self._canvas.rasterize(framebuffer)
+
+    def save(self, filename: str):
+        """
+        Salva o quadro atual. O formato vem da extensão: .svg ou .ppm.
+        """
+
+        if filename.endswith(".svg"):
+            with open(filename, "w") as file:
+                file.write(self._canvas.to_svg())
+        elif filename.endswith(".ppm"):
+            with open(filename, "wb") as file:
+                file.write(self.framebuffer().to_ppm())
+        else:
+            raise ValueError(f"Formato não suportado: {filename}")
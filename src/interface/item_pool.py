@@ -0,0 +1,69 @@
+from tkinter import Canvas
+
+
+class CanvasItemPool:
+    """
+    Itens do canvas de um shape, reaproveitados entre quadros.
+
+    Tem a mesma interface de criação do Canvas, então `Shape.draw` não precisa saber dele:
+    cada create_* reaproveita o próximo item livre com `coords`/`itemconfigure` e só cria
+    um item novo quando o shape passou a desenhar mais itens que no quadro anterior.
+    """
+
+    _canvas: Canvas
+    _items: list[tuple[str, int, dict]]
+    _used: int
+
+    def __init__(self, canvas: Canvas) -> None:
+        self._canvas = canvas
+        self._items = []
+        self._used = 0
+
+    def begin(self):
+        self._used = 0
+
+    def end(self):
+        """
+        Apaga os itens que sobraram do quadro anterior e não foram usados neste.
+        """
+
+        for _, item, _ in self._items[self._used :]:
+            self._canvas.delete(item)
+        del self._items[self._used :]
+
+    def clear(self):
+        self.begin()
+        self.end()
+
+    def create_line(self, *coords, **options) -> int:
+        return self.__item("line", coords, options)
+
+    def create_oval(self, *coords, **options) -> int:
+        return self.__item("oval", coords, options)
+
+    def create_polygon(self, *coords, **options) -> int:
+        return self.__item("polygon", coords, options)
+
+    def __item(self, kind: str, coords: tuple, options: dict) -> int:
+        index = self._used
+        self._used += 1
+
+        if index < len(self._items):
+            old_kind, item, old_options = self._items[index]
+            if old_kind == kind:
+                self._canvas.coords(item, *coords)
+                # itemconfigure também custa uma chamada ao Tcl, então só quando algo mudou (ex.: cor de seleção).
+                if options != old_options:
+                    self._canvas.itemconfigure(item, **options)
+                    self._items[index] = (kind, item, options)
+                return item
+
+            self._canvas.delete(item)
+
+        item = getattr(self._canvas, f"create_{kind}")(*coords, **options)
+        if index < len(self._items):
+            self._items[index] = (kind, item, options)
+        else:
+            self._items.append((kind, item, options))
+
+        return item
@@ -0,0 +1,62 @@
+from tkinter import Misc, PhotoImage
+
+import numpy as np
+import numpy.typing as npt
+
+from display_file import DisplayFile
+from interface.framebuffer import Framebuffer
+from interface.viewport import RenderJob, Viewport
+from interface.window import Window
+from shape import Shape
+from vector3 import Vector3
+
+
+class RasterViewport(Viewport):
+    """
+    Viewport que rasteriza os shapes num Framebuffer e mostra o quadro inteiro como uma única imagem no canvas.
+    O custo de um quadro depende do número de pixels desenhados, e não do número de itens do Tk.
+    """
+
+    _framebuffer: Framebuffer
+    _image: PhotoImage
+
+    def __init__(
+        self,
+        min_vec: Vector3,
+        max_vec: Vector3,
+        parent: Misc,
+        background_color: str = "gray75",
+    ):
+        super().__init__(min_vec, max_vec, parent, background_color)
+
+        canvas_size = self._max - self._min
+        width, height = int(canvas_size.x), int(canvas_size.y)
+        self._framebuffer = Framebuffer(
+            width, height, background_color, lambda color: tuple(value >> 8 for value in self._canvas.winfo_rgb(color))
+        )
+
+        self._image = PhotoImage(master=self._canvas, width=width, height=height)
+        image_item = self._canvas.create_image(0, 0, image=self._image, anchor="nw")
+        # a borda criada pelo Viewport fica por cima da imagem.
+        self._canvas.tag_lower(image_item)
+
+    @property
+    def framebuffer(self) -> Framebuffer:
+        return self._framebuffer
+
+    def release(self, shape: Shape):
+        # não há itens por shape: o quadro todo é redesenhado.
+        pass
+
+    def prepare(self, window: Window, display_file: DisplayFile) -> RenderJob:
+        # o quadro é redesenhado do zero, então todos os shapes entram.
+        display_file.all_dirty()
+        return super().prepare(window, display_file)
+
+    def present(self, job: RenderJob):
+        self._framebuffer.clear()
+        super().present(job)
+        self._image.configure(data=self._framebuffer.to_ppm())
+
+    def _draw_shape(self, shape: Shape, points: npt.NDArray[np.float64]):
+        shape.draw(self._framebuffer, points)
@@ -0,0 +1,141 @@
+import traceback
+from collections import deque
+from queue import Empty, SimpleQueue
+from threading import Thread
+from time import perf_counter
+from tkinter import Misc
+from typing import Optional
+
+from display_file import DisplayFile
+from interface.viewport import RenderJob, Viewport
+from interface.window import Window
+
+
+class RenderWorker:
+    """
+    Roda `Viewport.compute` (projeção, clipping e transformada de viewport) num thread separado.
+
+    O thread do Tk só prepara o quadro e desenha o resultado: os RenderJobs prontos voltam por uma fila
+    que é lida com `after`. Quadros que ficaram velhos na fila, porque outro foi pedido depois, são descartados
+    sem serem processados; os seus shapes entram no próximo quadro. Um quadro já processado é desenhado se
+    for mais novo do que o último desenhado, mesmo que outro já tenha sido pedido: senão, com quadros que
+    demoram mais do que o intervalo entre pedidos, nenhum chegaria a aparecer.
+    """
+
+    POLL_MS = 5
+    # janela, em segundos, sobre a qual o FPS é medido.
+    FPS_WINDOW = 1.0
+
+    root: Misc
+    viewport: Viewport
+    _jobs: SimpleQueue[Optional[RenderJob]]
+    _results: SimpleQueue[RenderJob]
+    _frame: int
+    _presented: int
+    _polling: bool
+    _presents: deque[float]
+    _thread: Thread
+
+    def __init__(self, root: Misc, viewport: Viewport) -> None:
+        self.root = root
+        self.viewport = viewport
+        self._jobs = SimpleQueue()
+        self._results = SimpleQueue()
+        self._frame = 0
+        self._presented = 0
+        self._polling = False
+        self._presents = deque()
+
+        self._thread = Thread(target=self.__run, name="render-worker", daemon=True)
+        self._thread.start()
+
+    @property
+    def busy(self) -> bool:
+        return self._presented < self._frame
+
+    @property
+    def fps(self) -> float:
+        """
+        Quadros desenhados por segundo, medido sobre o último FPS_WINDOW.
+        """
+
+        self.__forget_old_presents(perf_counter())
+        if len(self._presents) < 2:
+            return 0.0
+
+        return (len(self._presents) - 1) / (self._presents[-1] - self._presents[0])
+
+    def submit(self, window: Window, display_file: DisplayFile):
+        self._frame += 1
+        job = self.viewport.prepare(window, display_file)
+        job.frame = self._frame
+        self._jobs.put(job)
+
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.POLL_MS, self.__poll)
+
+    def cancel(self):
+        """
+        Descarta os quadros pedidos até agora, ex.: quando a cena é trocada. Eles não chegam a ser desenhados.
+        """
+
+        self._frame += 1
+        self._presented = self._frame
+
+    def stop(self):
+        self._jobs.put(None)
+
+    def __run(self):
+        while True:
+            job = self._jobs.get()
+
+            # só o quadro mais novo da fila interessa.
+            while True:
+                try:
+                    newer = self._jobs.get_nowait()
+                except Empty:
+                    break
+                if newer is None:
+                    return
+                job = newer
+
+            if job is None:
+                return
+
+            try:
+                job = self.viewport.compute(job)
+            except Exception:
+                # um quadro com erro não pode parar o thread: o Tk conta o quadro como terminado e segue.
+                traceback.print_exc()
+                job.failed = True
+
+            self._results.put(job)
+
+    def __poll(self):
+        latest = None
+        while True:
+            try:
+                job = self._results.get_nowait()
+            except Empty:
+                break
+            if job.frame > self._presented and (latest is None or job.frame > latest.frame):
+                latest = job
+
+        if latest is not None:
+            self._presented = latest.frame
+            if not latest.failed:
+                self.viewport.present(latest)
+
+                now = perf_counter()
+                self._presents.append(now)
+                self.__forget_old_presents(now)
+
+        if self.busy:
+            self.root.after(self.POLL_MS, self.__poll)
+        else:
+            self._polling = False
+
+    def __forget_old_presents(self, now: float):
+        while self._presents and now - self._presents[0] > self.FPS_WINDOW:
+            self._presents.popleft()
@@ -1,19 +1,72 @@
-from copy import deepcopy
 from tkinter import Canvas, Misc
-from typing import Callable
+from typing import Callable, Optional
 
+import numpy as np
+import numpy.typing as npt
+
+from clipping import Clipper
 from display_file import DisplayFile
+from interface.item_pool import CanvasItemPool
 from interface.window import Window
-from projections import parallel_projection, perspective_projection
+from projections import View, perspective_projection
 from shape import Shape
 from vector3 import Vector3
 
 
+class RenderJob:
+    """
+    Estado de um quadro copiado do thread do Tk: a view, os limites da window e os arrays de cada shape.
+    Depois de `Viewport.compute`, `screen_points` tem os pontos em coordenadas do canvas de cada shape.
+    """
+
+    frame: int
+    view: View
+    window_min: Vector3
+    window_max: Vector3
+    zoom: int
+    simplify_tolerance: float
+    shapes: list[Shape]
+    points: list[npt.NDArray[np.float64]]
+    model_matrices: list[npt.NDArray[np.float64]]
+    buffers: list[npt.NDArray[np.float64]]
+    edges: list[Optional[npt.NDArray[np.int_]]]
+    culled: list[Shape]
+    screen_points: list[npt.NDArray[np.float64]]
+    failed: bool
+    prepared: int
+
+    def __init__(self, view: View, window: Window, simplify_tolerance: float) -> None:
+        self.frame = 0
+        self.view = view
+        # cópias: a transformada de viewport mexe nesses vetores.
+        self.window_min = Vector3(window.min_ppc.x, window.min_ppc.y, window.min_ppc.z)
+        self.window_max = Vector3(window.max_ppc.x, window.max_ppc.y, window.max_ppc.z)
+        self.zoom = window.n_zoom
+        self.simplify_tolerance = simplify_tolerance
+        self.shapes = []
+        self.points = []
+        self.model_matrices = []
+        self.buffers = []
+        self.edges = []
+        self.culled = []
+        self.screen_points = []
+        # True quando `compute` falhou: o quadro não é desenhado e os shapes continuam pendentes.
+        self.failed = False
+        # número do `Viewport.prepare` que criou o job.
+        self.prepared = 0
+
+
 class Viewport:
     _canvas: Canvas
     _min: Vector3
     _max: Vector3
-    projection: Callable[[Window, DisplayFile], None]
+    _items: dict[str, CanvasItemPool]
+    # shapes que mudaram e ainda não foram desenhados, com o número do prepare que os marcou.
+    _pending: dict[str, int]
+    _prepared: int
+    projection: Callable[[Window], View]
+    # tolerância em pixels da simplificação dos pontos antes do draw. 0 desliga.
+    simplify_tolerance: float
 
     def __init__(
         self,
@@ -25,9 +78,25 @@ class Viewport:
         self._min = min_vec
         self._max = max_vec
         self.projection = perspective_projection
+        self.simplify_tolerance = 0.0
+
+        self._canvas = self._create_canvas(parent, background_color)
+        self._items = {}
+        self._pending = {}
+        self._prepared = 0
 
+        # a borda não muda entre quadros, então é criada uma vez só.
+        self._canvas.create_rectangle(
+            10,
+            10,
+            self._max.x - self._min.x - 10,
+            self._max.y - self._min.y - 10,
+            outline="red",
+        )
+
+    def _create_canvas(self, parent: Misc, background_color: str) -> Canvas:
         canvas_size = self._max - self._min
-        self._canvas = Canvas(
+        return Canvas(
             parent,
             width=canvas_size.x,
             height=canvas_size.y,
@@ -40,15 +109,20 @@ class Viewport:
     def canvas(self) -> Canvas:
         return self._canvas
 
-    def _viewport_transform(self, window_min: Vector3, window_max: Vector3, points: list[Vector3], zoom: int) -> list[Vector3]:
-        converted_points = deepcopy(points)
+    def _viewport_transform(
+        self, window_min: Vector3, window_max: Vector3, points: npt.NDArray[np.float64], zoom: int
+    ) -> npt.NDArray[np.float64]:
+        """
+        Converte os pontos recortados para coordenadas do canvas, sobrescrevendo o próprio array.
+        """
+
+        converted_points = points[:, :2]
         const = 0.01 if zoom < 40 else 0.05 if zoom < 70 else 0.025 if zoom < 180 else 0.03 if zoom < 250 else 0.032
         window_max += 10 - zoom * const
         window_min -= 10 - zoom * const
 
-        for point in converted_points:
-            point.x = ((point.x - window_min.x) / (window_max.x - window_min.x)) * (self._max.x - self._min.y)
-            point.y = (1 - (point.y - window_min.y) / (window_max.y - window_min.y)) * (self._max.y - self._min.y)
+        converted_points[:, 0] = ((converted_points[:, 0] - window_min.x) / (window_max.x - window_min.x)) * (self._max.x - self._min.y)
+        converted_points[:, 1] = (1 - (converted_points[:, 1] - window_min.y) / (window_max.y - window_min.y)) * (self._max.y - self._min.y)
         window_min += 10 - zoom * const
         window_max -= 10 - zoom * const
 
@@ -57,37 +131,123 @@ class Viewport:
     def clean(self, display_file: DisplayFile):
         for shape in display_file:
             if shape.dirty:
-                self.canvas.delete(shape.id)
+                self.release(shape)
+                self._pending.pop(shape.id, None)
+
+    def release(self, shape: Shape):
+        """
+        Apaga os itens do canvas de um shape.
+        """
+
+        items = self._items.pop(shape.id, None)
+        if items is not None:
+            items.clear()
 
     def draw(self, window: Window, display_file: DisplayFile):
-        self.clean(display_file)
-        self.canvas.create_rectangle(
-            10,
-            10,
-            self._max.x - self._min.x - 10,
-            self._max.y - self._min.y - 10,
-            outline="red",
-        )
-        
+        self.present(self.compute(self.prepare(window, display_file)))
+
+    def prepare(self, window: Window, display_file: DisplayFile) -> "RenderJob":
+        """
+        Parte do quadro que mexe no estado dos shapes (culling e nível de detalhe), feita no thread do Tk.
+        O resto é copiado para o RenderJob, que pode ser processado em outro thread.
+        """
+
+        view = self.projection(window)
+        job = RenderJob(view, window, self.simplify_tolerance)
+        self._prepared += 1
+        job.prepared = self._prepared
+
+        # shapes de quadros que foram descartados antes de aparecer também precisam ser desenhados.
         for shape in display_file:
             if shape.dirty:
-                shape.ppc_points = deepcopy(shape.points)
+                self._pending[shape.id] = job.prepared
+                shape.dirty = False
 
-        self.projection(window, display_file)
-        window.ppc_transformation(display_file)
+        # shapes fora do volume de visão não passam da consulta ao índice espacial.
+        visible = set(display_file.visible(view))
 
-        window_max = window.max_ppc
-        window_min = window.min_ppc
+        # curvas e superfícies retesselam de acordo com o seu tamanho na tela.
+        pixels_per_unit = (self._max.x - self._min.x) / (job.window_max.x - job.window_min.x)
         for shape in display_file:
-            if not shape.dirty:
+            if shape.id not in self._pending:
+                continue
+
+            if shape not in visible:
+                job.culled.append(shape)
                 continue
-            points = shape.clipper.clip(shape.ppc_points, window_max, window_min)
-            transformed_points = self._viewport_transform(window_min, window_max, points, window.n_zoom)
+
+            if shape.update_level_of_detail(view, pixels_per_unit):
+                display_file.moved(shape)
+
+            job.shapes.append(shape)
+            job.points.append(shape.points)
+            job.model_matrices.append(shape.model_matrix)
+            job.buffers.append(shape.ppc_buffer())
+            job.edges.append(shape.edges)
+
+        return job
+
+    def compute(self, job: "RenderJob") -> "RenderJob":
+        """
+        Projeção, clipping e transformada de viewport. Só lê o que está no job, então pode rodar fora do thread do Tk.
+        """
+
+        for points, model_matrix, buffer in zip(job.points, job.model_matrices, job.buffers):
+            job.view.project(points, model_matrix, out=buffer)
+
+        # shapes com o mesmo clipper são recortados juntos.
+        by_clipper: dict[type[Clipper], list[int]] = {}
+        for i, shape in enumerate(job.shapes):
+            by_clipper.setdefault(shape.clipper, []).append(i)
+
+        clipped: list[npt.NDArray[np.float64]] = [None] * len(job.shapes)
+        for clipper, indices in by_clipper.items():
+            # shapes com arestas indexadas projetam cada ponto uma vez só, e os segmentos são montados aqui.
+            points_list = [job.buffers[i] if job.edges[i] is None else job.buffers[i][job.edges[i]].reshape(-1, 4) for i in indices]
+            results = clipper.clip_many(points_list, job.window_max, job.window_min)
+            for i, points in zip(indices, results):
+                clipped[i] = points
+
+        for shape, points in zip(job.shapes, clipped):
+            transformed_points = self._viewport_transform(job.window_min, job.window_max, points, job.zoom)
             #final_points = shape.process_clipped_points(points, transformed_points, window_min, window_max)
             final_points = transformed_points
+            if job.simplify_tolerance > 0:
+                final_points = shape.simplify_clipped_points(final_points, job.simplify_tolerance)
+
+            job.screen_points.append(final_points)
+
+        return job
 
-            if not len(final_points):
+    def present(self, job: "RenderJob"):
+        """
+        Desenha no canvas os pontos calculados por `compute`. Roda no thread do Tk.
+        """
+
+        for shape in job.culled:
+            self.release(shape)
+            self.__drawn(shape, job)
+
+        for shape, points in zip(job.shapes, job.screen_points):
+            self.__drawn(shape, job)
+            if not len(points):
+                self.release(shape)
                 continue
 
-            shape.draw(self.canvas, final_points)
-            shape.dirty = False
+            self._draw_shape(shape, points)
+
+    def __drawn(self, shape: Shape, job: "RenderJob"):
+        # um quadro mais antigo pode aparecer depois de outro ter sido preparado; o shape só deixa de estar
+        # pendente se não mudou de novo depois desse quadro.
+        if self._pending.get(shape.id, 0) <= job.prepared:
+            self._pending.pop(shape.id, None)
+
+    def _draw_shape(self, shape: Shape, points: npt.NDArray[np.float64]):
+        # os itens do quadro anterior são reaproveitados em vez de apagados e recriados.
+        items = self._items.get(shape.id)
+        if items is None:
+            items = self._items[shape.id] = CanvasItemPool(self.canvas)
+
+        items.begin()
+        shape.draw(items, points)
+        items.end()
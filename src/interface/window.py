@@ -1,13 +1,12 @@
 from copy import deepcopy
 from hmac import new
-from math import atan2, degrees, pi
+from math import degrees
 from tkinter import StringVar
 import traceback
 
 import numpy as np
 
-from shape import Shape
-from transformations import Transformer2D, Transformer3D
+from transformations import Transformer3D
 from vector3 import Vector3
 
 
@@ -65,26 +64,6 @@ class Window:
         self.vpn = self.vpn / np.linalg.norm(self.vpn) + self.vrp
         self.cop = -self.vpn - 50
 
-    def ppc_transformation(self, shapes: list[Shape]):
-        transformer = Transformer2D()
-        wcx, wcy, _ = transformer.center(self.ppc_points)
-
-        transformer.points = self.ppc_points[:]
-        for shape in shapes:
-            if shape.dirty:
-                transformer.points += shape.ppc_points
-
-        transformer.translation(Vector3(-wcx, -wcy))
-
-        x = transformer.points[3].x - transformer.points[0].x
-        y = transformer.points[3].y - transformer.points[0].y
-        degree = atan2(y, x) - pi / 2
-
-        if abs(degree) > 1e-6:
-            transformer.rotate(degree, Vector3(wcx, wcy))
-
-        transformer.apply()
-
     @property
     def v_up(self) -> tuple[Vector3, Vector3]:
         return self.points[0], self.points[3]
@@ -1,69 +1,143 @@
-from copy import deepcopy
-from math import acos, pi
-from typing import TYPE_CHECKING
+from itertools import product
+from math import acos, atan2, cos, pi, sin, sqrt
+from typing import TYPE_CHECKING, Optional
 
 import numpy as np
+import numpy.typing as npt
 
-from display_file import DisplayFile
 from transformations import Transformer3D
-from vector3 import Vector3
+from vector3 import Vector3, to_homogeneous
 
 if TYPE_CHECKING:
     from interface import Window
-
-def parallel_projection(window: "Window", display_file: DisplayFile):
-    window.ppc_points = deepcopy(window.points)
-    points = window.ppc_points[:]
-
-    for shape in display_file:
-        if shape.dirty:
-            points += shape.ppc_points
-
-    vrp = deepcopy(window.vrp)
-    vpn = deepcopy(window.vpn) - vrp
+    from shape import Shape
+
+
+class View:
+    """
+    Matriz de visualização de um quadro: leva pontos do mundo direto para o PPC.
+    """
+
+    matrix: npt.NDArray[np.float64]
+    d: Optional[float]
+    window_min: Vector3
+    window_max: Vector3
+
+    def __init__(self, matrix: npt.NDArray[np.float64], window: "Window", d: Optional[float] = None) -> None:
+        self.matrix = matrix
+        # distância do plano de projeção. None na projeção paralela.
+        self.d = d
+        self.window_min = window.min_ppc
+        self.window_max = window.max_ppc
+
+    def __sphere_outside(self, center: npt.NDArray[np.float64], radius: float) -> bool:
+        # a matriz de visualização é rígida, então o raio não muda.
+        x, y, z, _ = np.matmul(np.append(center, 1), self.matrix)
+        wmin, wmax = self.window_min, self.window_max
+
+        if self.d is None:
+            return x + radius < wmin.x or x - radius > wmax.x or y + radius < wmin.y or y - radius > wmax.y
+
+        d = self.d
+        if z - radius < d:
+            # a esfera chega na região onde o z é limitado a d, e os planos do frustum não valem ali.
+            # Quem decide é o teste da caixa, que limita o z como `project`.
+            return False
+
+        # planos laterais do frustum, todos passando pelo COP (a origem).
+        return (
+            (d * x - wmax.x * z) / sqrt(d**2 + wmax.x**2) > radius
+            or (wmin.x * z - d * x) / sqrt(d**2 + wmin.x**2) > radius
+            or (d * y - wmax.y * z) / sqrt(d**2 + wmax.y**2) > radius
+            or (wmin.y * z - d * y) / sqrt(d**2 + wmin.y**2) > radius
+        )
+
+    def __box_outside(self, low: npt.NDArray[np.float64], high: npt.NDArray[np.float64]) -> bool:
+        corners = np.matmul(to_homogeneous(product(*zip(low, high))), self.matrix)
+
+        if self.d is not None:
+            # mesmo limite de z que `project`. x * d / max(z, d) é linear em x e monotônico em z, então
+            # a projeção da caixa inteira fica dentro do retângulo envolvente dos cantos projetados.
+            np.maximum(corners[:, 2], self.d, out=corners[:, 2])
+            corners[:, :2] *= self.d / corners[:, 2:3]
+
+        x_min, y_min = corners[:, :2].min(axis=0)
+        x_max, y_max = corners[:, :2].max(axis=0)
+        wmin, wmax = self.window_min, self.window_max
+        return x_max < wmin.x or x_min > wmax.x or y_max < wmin.y or y_min > wmax.y
+
+    def sees(self, shape: "Shape") -> bool:
+        """
+        Teste conservador do volume envolvente do shape contra o volume de visão.
+        False significa que nenhum ponto do shape aparece na window.
+        """
+
+        if not len(shape.points):
+            return False
+
+        if self.__sphere_outside(*shape.bounding_sphere):
+            return False
+
+        return self.sees_box(*shape.bounding_box)
+
+    def sees_box(self, low: npt.NDArray[np.float64], high: npt.NDArray[np.float64]) -> bool:
+        return not self.__box_outside(low, high)
+
+    def project(
+        self,
+        points: npt.NDArray[np.float64],
+        model_matrix: Optional[npt.NDArray[np.float64]] = None,
+        out: Optional[npt.NDArray[np.float64]] = None,
+    ) -> npt.NDArray[np.float64]:
+        matrix = self.matrix if model_matrix is None else np.matmul(model_matrix, self.matrix)
+        projected = np.matmul(points, matrix, out=out)
+
+        if self.d is not None:
+            d = self.d
+            np.maximum(projected[:, 2], d, out=projected[:, 2])
+            projected[:, :2] *= d / projected[:, 2:3]
+
+        return projected
+
+
+def _align_vpn(window: "Window") -> Transformer3D:
+    vrp = window.vrp
+    vpn = window.vpn - vrp
 
     # https://stackoverflow.com/a/10801900
     # Alinha VPN com o eixo Z
     angle = 2*pi - acos(np.dot(vpn, (0, 0, 1)))
     axis = np.cross(vpn, (0, 0, 1))
-    Transformer3D(points).translation(-vrp).rotate(angle, Vector3.from_array(axis)).apply()
+    return Transformer3D().translation(-vrp).rotate(angle, Vector3.from_array(axis))
 
-def perspective_projection(window: "Window", display_file: DisplayFile):
-    # print(f"AAAAAAAAAAAAA: {window.cop}")
-    window.ppc_points = deepcopy(window.points)
-    points = []
 
-    for shape in display_file:
-        if shape.dirty:
-            points += shape.ppc_points
+def _ppc_matrix(window: "Window", matrix: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    """
+    Leva a window para o PPC e retorna a matriz que a centraliza na origem com o VUP alinhado ao eixo Y.
+    """
 
-    vrp = deepcopy(window.vrp)
-    cop = deepcopy(window.cop)
-    vpn = deepcopy(window.vpn) - vrp
+    points = np.matmul(to_homogeneous(window.points), matrix)
 
-    #vpn = vpn / np.linalg.norm(vpn)
+    wcx, wcy = points[:, :2].mean(axis=0)
+    x, y = points[3, :2] - points[0, :2]
+    degree = atan2(y, x) - pi / 2
 
-    vpn2 = deepcopy(window.vpn)
+    ppc = Transformer3D().translation(Vector3(-wcx, -wcy, 0))
+    if abs(degree) > 1e-6:
+        ppc.arbitrary([[cos(degree), -sin(degree), 0, 0], [sin(degree), cos(degree), 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]])
 
-    # https://stackoverflow.com/a/10801900
-    # Alinha VPN com o eixo Z
+    window.ppc_points = [Vector3.from_array(p) for p in np.matmul(points, ppc.transformation_matrix)]
+    return np.matmul(matrix, ppc.transformation_matrix)
 
-    # print(f"{window.cop=}")
-    # print(f"{vpn=}, {np.dot(vpn, (0, 0, 1))=}")
-    angle = 2*pi - acos(np.dot(vpn, (0, 0, 1)))
-    axis = np.cross(vpn, (0, 0, 1))
 
+def parallel_projection(window: "Window") -> View:
+    matrix = _align_vpn(window).transformation_matrix
+    return View(_ppc_matrix(window, matrix), window)
+
+
+def perspective_projection(window: "Window") -> View:
     cop = Vector3(0, 0, -150)
-    Transformer3D(window.ppc_points[:] + [vpn2]).translation(-window.vrp).rotate(angle, Vector3.from_array(axis)).translation(-cop).apply()
-    Transformer3D(points).translation(-window.vrp).rotate(angle, Vector3.from_array(axis)).translation(-cop).apply()
-
-    # print(f"{vpn2=}, {window.ppc_points=}, {Transformer3D().center(window.ppc_points)=}")
-
-    d = window.min_ppc.z
-    # print(f"{points=}")
-    for point in points:
-        if point.z < d:
-            point.z = d
-        
-        point.x = point.x/(point.z/d)
-        point.y = point.y/(point.z/d)
+    matrix = _align_vpn(window).translation(-cop).transformation_matrix
+    matrix = _ppc_matrix(window, matrix)
+
+    return View(matrix, window, window.min_ppc.z)
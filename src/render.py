@@ -0,0 +1,74 @@
+"""
+Renderiza uma cena .obj sem display, girando a window a cada quadro.
+
+Exemplo: python3 src/render.py cube_and_pyramid.obj --frames 360 --degrees 1 --output frames/
+"""
+
+import argparse
+import contextlib
+import io
+from math import radians
+from pathlib import Path
+from time import perf_counter
+
+from clipping import CohenSutherland, LiangBarsky, SegmentClipper
+from descritor_obj import DescritorOBJ
+from interface import HeadlessViewport, Window
+from projections import parallel_projection, perspective_projection
+from transformations import Transformer3D
+from vector3 import Vector3
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scene", type=Path, help="arquivo .obj da cena")
+    parser.add_argument("--output", type=Path, default=None, help="diretório onde os quadros são salvos. Sem ele, nada é salvo")
+    parser.add_argument("--format", choices=("ppm", "svg"), default="ppm")
+    parser.add_argument("--frames", type=int, default=36)
+    parser.add_argument("--degrees", type=float, default=10.0, help="rotação da window entre quadros")
+    parser.add_argument("--axis", default="(10, 10, 10)", help="X, Y, Z (rotação da window em torno de si mesma) ou um eixo (x, y, z)")
+    parser.add_argument("--projection", choices=("perspective", "parallel"), default="perspective")
+    parser.add_argument("--clipping", choices=("cohen", "liang"), default="cohen")
+    parser.add_argument("--size", type=int, nargs=2, default=(800, 800), metavar=("WIDTH", "HEIGHT"))
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    width, height = args.size
+
+    # o load e a window imprimem bastante coisa para o log da interface.
+    with contextlib.redirect_stdout(io.StringIO()):
+        display_file, _ = DescritorOBJ.load(args.scene)
+        window = Window(Vector3(-100, -100, -100), Vector3(width, height, -300))
+
+    viewport = HeadlessViewport(Vector3(0, 0), Vector3(width, height))
+    viewport.projection = perspective_projection if args.projection == "perspective" else parallel_projection
+    SegmentClipper.line_clipper = CohenSutherland if args.clipping == "cohen" else LiangBarsky
+
+    if args.output is not None:
+        args.output.mkdir(parents=True, exist_ok=True)
+
+    axis = args.axis.strip().upper()
+    rotation = radians(args.degrees)
+
+    start = perf_counter()
+    for frame in range(args.frames):
+        viewport.draw(window, display_file)
+        if args.output is not None:
+            viewport.save(str(args.output / f"frame_{frame:05d}.{args.format}"))
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            if axis in ("X", "Y", "Z"):
+                window.rotate(rotation, axis)
+            else:
+                rotation_axis = Vector3.from_array([float(x) for x in axis[1:-1].split(",")])
+                Transformer3D(window.points[:] + [window.vpn, window.vrp]).rotate(rotation, rotation_axis).apply()
+        display_file.all_dirty()
+
+    elapsed = perf_counter() - start
+    print(f"{args.frames} quadros em {elapsed:.3f}s ({args.frames / elapsed:.1f} quadros/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+from time import perf_counter
+from tkinter import Misc
+from typing import Callable, Optional
+
+
+class FrameScheduler:
+    """
+    Junta os pedidos de redesenho: vários pedidos no mesmo ciclo do Tk viram um único quadro,
+    renderizado no próximo `after_idle`. Com `max_fps`, quadros muito próximos esperam o intervalo mínimo.
+    """
+
+    root: Misc
+    max_fps: Optional[float]
+    frames: int
+    _render: Callable[[], None]
+    _pending: Optional[str]
+    _last_frame: float
+
+    def __init__(self, root: Misc, render: Callable[[], None], max_fps: Optional[float] = None) -> None:
+        self.root = root
+        self.max_fps = max_fps
+        self.frames = 0
+        self._render = render
+        self._pending = None
+        self._last_frame = float("-inf")
+
+    @property
+    def pending(self) -> bool:
+        return self._pending is not None
+
+    def request(self):
+        """
+        Marca a cena para ser redesenhada. Não faz nada se já existe um quadro agendado.
+        """
+
+        if self._pending is not None:
+            return
+
+        wait = 0.0
+        if self.max_fps:
+            wait = self._last_frame + 1 / self.max_fps - perf_counter()
+
+        if wait > 0:
+            self._pending = self.root.after(max(int(wait * 1000), 1), self.__render)
+        else:
+            self._pending = self.root.after_idle(self.__render)
+
+    def __render(self):
+        self._pending = None
+        self._last_frame = perf_counter()
+        self.frames += 1
+        self._render()
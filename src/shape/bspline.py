@@ -1,17 +1,31 @@
 from tkinter import Canvas
+from typing import TYPE_CHECKING
 
+import numpy as np
+import numpy.typing as npt
 from numpy import array, matmul
+from numpy.lib.stride_tricks import sliding_window_view
 
 from clipping import BezierClipper
-from vector3 import Vector3
+from vector3 import Vector3, to_homogeneous
 
 from .shape import Shape
-from .utils import ignore_lines_in_window_border
+from .utils import bake_control_points, choose_level_of_detail, ignore_lines_in_window_border, polylines, screen_steps, simplify_segments
+
+if TYPE_CHECKING:
+    from projections import View
 
 
 class BSpline(Shape):
     shape_name: str = "BSpline"
     clipper = BezierClipper
+    control_points: list[Vector3]
+
+    # nível de detalhe: passos por segmento escolhidos pelo tamanho na tela.
+    level_of_detail: bool = True
+    min_points_per_segment: int = 2
+    max_points_per_segment: int = 100
+    pixels_per_step: float = 8.0
 
     def __init__(
         self,
@@ -20,38 +34,70 @@ class BSpline(Shape):
         color: str = "red",
         points_per_segment: int = 10,
     ) -> None:
-        super().__init__(points, name, color)
+        # os pontos de controle são guardados para poder retesselar quando o nível de detalhe muda.
+        self.control_points = points
+        super().__init__([], name, color)
 
         self.points_per_segment = min(max(points_per_segment, 1), 1000)
 
         self._calculate_delta_matrix()
         self._bsplines()
 
+    def bake(self):
+        # a retesselação parte dos pontos de controle, então eles também recebem a model_matrix.
+        self.control_points = bake_control_points(self.control_points, self.model_matrix)
+        super().bake()
+
+    def _control_array(self) -> npt.NDArray[np.float64]:
+        return to_homogeneous(self.control_points)
+
+    def _control_groups(self) -> npt.NDArray[np.int_]:
+        """
+        Índices dos pontos de controle de cada segmento da curva.
+        """
+
+        return np.arange(0, len(self.control_points) - 3)[:, None] + np.arange(4)
+
+    def update_level_of_detail(self, view: "View", pixels_per_unit: float) -> bool:
+        if not self.level_of_detail:
+            return False
+
+        wanted = screen_steps(view, self._control_array(), self._control_groups(), self.model_matrix, pixels_per_unit, self.pixels_per_step)
+        steps = choose_level_of_detail(self.points_per_segment, wanted, self.min_points_per_segment, self.max_points_per_segment)
+        if steps == self.points_per_segment:
+            return False
+
+        self.points_per_segment = steps
+        self._calculate_delta_matrix()
+        self._bsplines()
+        return True
+
     def serialize(self, vertices: dict[Vector3, int], hex_to_color: dict[str, str]) -> str:
         raise NotImplementedError
 
     def process_clipped_points(
         self,
-        points: list[Vector3],
-        transformed_points: list[Vector3],
+        points: npt.NDArray[np.float64],
+        transformed_points: npt.NDArray[np.float64],
         window_min: Vector3,
         window_max: Vector3,
-    ) -> list[Vector3]:
+    ) -> npt.NDArray[np.float64]:
         return ignore_lines_in_window_border(points, transformed_points, window_min, window_max)
 
     def _bsplines(self) -> None:
         new_points = []
         coeficients = self._calculate_coefficients()
+        deltas = matmul(self.delta_matrix, coeficients)
 
-        for i in range(len(coeficients["X"])):
-            D_x = matmul(self.delta_matrix, coeficients["X"][i])
-            D_y = matmul(self.delta_matrix, coeficients["Y"][i])
-            D_z = matmul(self.delta_matrix, coeficients["Z"][i])
-
-            points = self._calculate_segment_points(D_x, D_y, D_z)
+        for D in deltas:
+            points = self._calculate_segment_points(D[:, 0], D[:, 1], D[:, 2])
             new_points.extend(points)
 
-        self.points = new_points
+        if len(coeficients):
+            # as diferenças adiantadas param antes de t = 1: o fim do último segmento é a soma dos seus coeficientes.
+            new_points.append(Vector3.from_array(coeficients[-1].sum(axis=0)))
+
+        self.points = to_homogeneous(new_points)
 
     def _calculate_delta_matrix(self) -> None:
         delta = 1 / self.points_per_segment
@@ -65,43 +111,27 @@ class BSpline(Shape):
             [6 * delta3, 0, 0, 0],
         ]
 
-    def _calculate_coefficients(self) -> None:
-        Mbs = [
-            [-1 / 6, 3 / 6, -3 / 6, 1 / 6],
-            [3 / 6, -6 / 6, 3 / 6, 0],
-            [-3 / 6, 0, 3 / 6, 0],
-            [1 / 6, 4 / 6, 1 / 6, 0],
-        ]
-
-        coeficients = {"X": [], "Y": [], "Z": []}
-
-        for i in range(3, len(self.points), 1):
-            Gbs_x = [
-                self.points[i - 3].x,
-                self.points[i - 2].x,
-                self.points[i - 1].x,
-                self.points[i].x,
+    def _calculate_coefficients(self) -> npt.NDArray[np.float64]:
+        """
+        Coeficientes Mbs . Gbs de todos os segmentos, (segmentos, 4, 4), com uma coluna por coordenada.
+        """
+
+        Mbs = array(
+            [
+                [-1 / 6, 3 / 6, -3 / 6, 1 / 6],
+                [3 / 6, -6 / 6, 3 / 6, 0],
+                [-3 / 6, 0, 3 / 6, 0],
+                [1 / 6, 4 / 6, 1 / 6, 0],
             ]
+        )
 
-            Gbs_y = [
-                self.points[i - 3].y,
-                self.points[i - 2].y,
-                self.points[i - 1].y,
-                self.points[i].y,
-            ]
+        control_points = self._control_array()
+        if len(control_points) < 4:
+            return np.empty((0, 4, 4))
 
-            Gbs_z = [
-                self.points[i - 3].z,
-                self.points[i - 2].z,
-                self.points[i - 1].z,
-                self.points[i].z,
-            ]
-
-            coeficients["X"].append(matmul(Mbs, Gbs_x))
-            coeficients["Y"].append(matmul(Mbs, Gbs_y))
-            coeficients["Z"].append(matmul(Mbs, Gbs_z))
-
-        return coeficients
+        # Gbs de cada segmento são 4 pontos consecutivos: janelas (segmentos, 4, coordenadas) sem cópia.
+        geometry = sliding_window_view(control_points, 4, axis=0).transpose(0, 2, 1)
+        return matmul(Mbs, geometry)
 
     def _calculate_segment_points(self, x_delta: array, y_delta: array, z_delta: array) -> list[Vector3]:
         new_points = []
@@ -129,9 +159,9 @@ class BSpline(Shape):
 
         return new_points
 
-    def draw(self, canvas: Canvas, points: list[Vector3]) -> None:
-        new_points = []
-        for i in range(0, len(points), 2):
-            new_points.append((points[i], points[i + 1]))
-        for p1, p2 in new_points:
-            canvas.create_line(p1.x, p1.y, p2.x, p2.y, width=3, fill=self.color, tags=self.id)
+    def simplify_clipped_points(self, points: npt.NDArray[np.float64], tolerance: float) -> npt.NDArray[np.float64]:
+        return simplify_segments(points, tolerance)
+
+    def draw(self, canvas: Canvas, points: npt.NDArray[np.float64]) -> None:
+        for polyline in polylines(points):
+            canvas.create_line(*polyline.ravel(), width=3, fill=self.color, tags=self.id)
@@ -1,19 +1,20 @@
-from copy import deepcopy
-
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
-from clipping import Bezier3DClipper
+from clipping import SegmentClipper
 from transformations import Transformer3D
-from vector3 import Vector3
+from vector3 import Vector3, to_homogeneous
 
 from .bspline import BSpline
+from .tessellation import bspline_patch_grids, patch_edges, tessellate_patches
 
 
 class BSpline3D(BSpline):
     control_points: list[Vector3]
     shape_name: str = "bspline3D"
     transformer = Transformer3D
-    clipper = Bezier3DClipper
+    clipper = SegmentClipper
+    max_points_per_segment = 30
 
     def __init__(
         self,
@@ -23,161 +24,54 @@ class BSpline3D(BSpline):
         points_per_segment: int = 10,
     ) -> None:
 
-        self.control_points = control_points
-        super().__init__([], name, color, points_per_segment)
+        super().__init__(control_points, name, color, points_per_segment)
+
+    def _control_array(self) -> np.ndarray:
+        return to_homogeneous([point for line in self.control_points for point in line])
+
+    def _control_groups(self) -> np.ndarray:
+        # os patches são as janelas 4x4 da grade de pontos de controle, como em _calculate_coefficients.
+        columns = len(self.control_points[0])
+        rows = np.arange(len(self.control_points) - 3)
+        window = (np.arange(4)[:, None] * columns + np.arange(4)).ravel()
+        return ((rows[:, None] * columns + np.arange(columns - 3)).reshape(-1, 1) + window).reshape(-1, 16)
 
     def _bsplines(self) -> None:
-        new_points = []
-        coeficients = self._calculate_coefficients()
+        C = self._calculate_coefficients()
 
         NST = self.points_per_segment
         Delta = 1 / (NST - 1)
 
-        EDelta = [[0, 0, 0, 1], [Delta**3, Delta**2, Delta, 0], [6 * Delta**3, 2 * Delta**2, 0, 0], [6 * Delta**3, 0, 0, 0]]
-
-        EDeltaT = np.transpose(EDelta)
-
-        for i in range(len(coeficients["X"])):
-            DX = np.matmul(np.matmul(EDelta, coeficients["X"][i]), EDeltaT)
-            DY = np.matmul(np.matmul(EDelta, coeficients["Y"][i]), EDeltaT)
-            DZ = np.matmul(np.matmul(EDelta, coeficients["Z"][i]), EDeltaT)
-
-            DXT = np.transpose(deepcopy(DX))
-            DYT = np.transpose(deepcopy(DY))
-            DZT = np.transpose(deepcopy(DZ))
+        EDelta = np.array([[0, 0, 0, 1], [Delta**3, Delta**2, Delta, 0], [6 * Delta**3, 2 * Delta**2, 0, 0], [6 * Delta**3, 0, 0, 0]])
 
-            # s
-            for _ in range(NST):
-                points = self._calculate_segment_points(DX[0], DY[0], DZ[0])
-                for j in range(len(points) - 1):
-                    new_points.append(deepcopy(points[j]))
-                    new_points.append(deepcopy(points[j + 1]))
+        # (patches, 3, 4, 4): E . C . E^T de cada coordenada. As diferenças adiantadas avançam todos os patches
+        # juntos, em outros processos quando há muitos patches, e geram a grade de cada patch uma vez só.
+        deltas = np.matmul(np.matmul(EDelta, C), EDelta.T)
 
-                for j in range(3):
-                    for k in range(4):
-                        DX[j][k] += DX[j + 1][k]
-                        DY[j][k] += DY[j + 1][k]
-                        DZ[j][k] += DZ[j + 1][k]
+        self.points = to_homogeneous(tessellate_patches(bspline_patch_grids, deltas, NST))
+        self.edges = patch_edges(len(deltas), NST)
 
-            # t
-            for _ in range(NST):
-                points = self._calculate_segment_points(DXT[0], DYT[0], DZT[0])
+    def _calculate_coefficients(self) -> np.ndarray:
+        """
+        Coeficientes M . G . M^T de cada coordenada de todos os patches, (patches, 3, 4, 4).
+        """
 
-                for j in range(len(points) - 1):
-                    new_points.append(deepcopy(points[j]))
-                    new_points.append(deepcopy(points[j + 1]))
-
-                for j in range(3):
-                    for k in range(4):
-                        DXT[j][k] += DXT[j + 1][k]
-                        DYT[j][k] += DYT[j + 1][k]
-                        DZT[j][k] += DZT[j + 1][k]
-
-        self.points = new_points
-        self.transformer.points = new_points
-
-    def _calculate_coefficients(self) -> None:
         M = np.array([[-1, 3, -3, 1], [3, -6, 3, 0], [-3, 3, 0, 0], [1, 0, 0, 0]])
 
-        MT = np.transpose(M)
-
-        coeficients = {"X": [], "Y": [], "Z": []}
-
-        for i in range(len(self.control_points) - 3):
-            for j in range(len(self.control_points) - 3):
-                Gx = np.array(
-                    [
-                        [
-                            self.control_points[i][j].x,
-                            self.control_points[i][j + 1].x,
-                            self.control_points[i][j + 2].x,
-                            self.control_points[i][j + 3].x,
-                        ],
-                        [
-                            self.control_points[i + 1][j].x,
-                            self.control_points[i + 1][j + 1].x,
-                            self.control_points[i + 1][j + 2].x,
-                            self.control_points[i + 1][j + 3].x,
-                        ],
-                        [
-                            self.control_points[i + 2][j].x,
-                            self.control_points[i + 2][j + 1].x,
-                            self.control_points[i + 2][j + 2].x,
-                            self.control_points[i + 2][j + 3].x,
-                        ],
-                        [
-                            self.control_points[i + 3][j].x,
-                            self.control_points[i + 3][j + 1].x,
-                            self.control_points[i + 3][j + 2].x,
-                            self.control_points[i + 3][j + 3].x,
-                        ],
-                    ]
-                )
-
-                Gy = np.array(
-                    [
-                        [
-                            self.control_points[i][j].y,
-                            self.control_points[i][j + 1].y,
-                            self.control_points[i][j + 2].y,
-                            self.control_points[i][j + 3].y,
-                        ],
-                        [
-                            self.control_points[i + 1][j].y,
-                            self.control_points[i + 1][j + 1].y,
-                            self.control_points[i + 1][j + 2].y,
-                            self.control_points[i + 1][j + 3].y,
-                        ],
-                        [
-                            self.control_points[i + 2][j].y,
-                            self.control_points[i + 2][j + 1].y,
-                            self.control_points[i + 2][j + 2].y,
-                            self.control_points[i + 2][j + 3].y,
-                        ],
-                        [
-                            self.control_points[i + 3][j].y,
-                            self.control_points[i + 3][j + 1].y,
-                            self.control_points[i + 3][j + 2].y,
-                            self.control_points[i + 3][j + 3].y,
-                        ],
-                    ]
-                )
-                Gz = np.array(
-                    [
-                        [
-                            self.control_points[i][j].z,
-                            self.control_points[i][j + 1].z,
-                            self.control_points[i][j + 2].z,
-                            self.control_points[i][j + 3].z,
-                        ],
-                        [
-                            self.control_points[i + 1][j].z,
-                            self.control_points[i + 1][j + 1].z,
-                            self.control_points[i + 1][j + 2].z,
-                            self.control_points[i + 1][j + 3].z,
-                        ],
-                        [
-                            self.control_points[i + 2][j].z,
-                            self.control_points[i + 2][j + 1].z,
-                            self.control_points[i + 2][j + 2].z,
-                            self.control_points[i + 2][j + 3].z,
-                        ],
-                        [
-                            self.control_points[i + 3][j].z,
-                            self.control_points[i + 3][j + 1].z,
-                            self.control_points[i + 3][j + 2].z,
-                            self.control_points[i + 3][j + 3].z,
-                        ],
-                    ]
-                )
-
-                coeficients["X"].append(np.matmul(np.matmul(M, Gx), MT))
-                coeficients["Y"].append(np.matmul(np.matmul(M, Gy), MT))
-                coeficients["Z"].append(np.matmul(np.matmul(M, Gz), MT))
-
-        return coeficients
+        rows, columns = len(self.control_points), len(self.control_points[0])
+        if rows < 4 or columns < 4:
+            return np.empty((0, 3, 4, 4))
+
+        # as geometrias G são as janelas 4x4 da grade, (linhas - 3, colunas - 3, 3, 4, 4), sem cópia.
+        control_points = self._control_array()[:, :3].reshape(rows, columns, 3)
+        geometry = sliding_window_view(control_points, (4, 4), axis=(0, 1)).reshape(-1, 3, 4, 4)
+        return np.matmul(np.matmul(M, geometry), M.T)
 
     def process_clipped_points(
-        self, points: list[Vector3], transformed_points: list[Vector3], window_min: Vector3, window_max: Vector3
-    ) -> list[Vector3]:
+        self,
+        points: np.ndarray,
+        transformed_points: np.ndarray,
+        window_min: Vector3,
+        window_max: Vector3,
+    ) -> np.ndarray:
         return transformed_points
@@ -1,20 +1,31 @@
-from copy import deepcopy
-from itertools import batched
 from tkinter import Canvas
+from typing import TYPE_CHECKING
 
-from numpy import arange
+import numpy as np
+import numpy.typing as npt
 
 from clipping import BezierClipper
 from shape import Shape
-from vector3 import Vector3
+from vector3 import Vector3, to_homogeneous
 
-from .utils import ignore_lines_in_window_border
+from .tessellation import bernstein_basis
+from .utils import bake_control_points, choose_level_of_detail, ignore_lines_in_window_border, polylines, screen_steps, simplify_segments
+
+if TYPE_CHECKING:
+    from projections import View
 
 
 class Curve2D(Shape):
     shape_name: str = "Curve2D"
     points_per_segment: int
     clipper = BezierClipper
+    control_points: list[Vector3]
+
+    # nível de detalhe: passos por segmento escolhidos pelo tamanho na tela.
+    level_of_detail: bool = True
+    min_points_per_segment: int = 2
+    max_points_per_segment: int = 100
+    pixels_per_step: float = 8.0
 
     def __init__(
         self,
@@ -23,68 +34,68 @@ class Curve2D(Shape):
         color: str = "red",
         points_per_segment: int = 10,
     ) -> None:
-        super().__init__(points, name, color)
+        # os pontos de controle são guardados para poder retesselar quando o nível de detalhe muda.
+        self.control_points = points
+        super().__init__([], name, color)
         self.points_per_segment = min(max(points_per_segment, 10), 100)
         self._bezier()
 
-    def _bezier(self) -> None:
-        new_points = []
-
-        print(self.points, self.points_per_segment)
-
-        for i in range(0, len(self.points) - 3, 3):
-            p1 = self.points[i]
-            p2 = self.points[i + 1]
-            p3 = self.points[i + 2]
-            p4 = self.points[i + 3]
+    def bake(self):
+        # a retesselação parte dos pontos de controle, então eles também recebem a model_matrix.
+        self.control_points = bake_control_points(self.control_points, self.model_matrix)
+        super().bake()
 
-            print(f"p1: {p1}, p2: {p2}, p3: {p3}, p4: {p4}")
+    def _control_array(self) -> npt.NDArray[np.float64]:
+        return to_homogeneous(self.control_points)
 
-            r1 = p2
-            r4 = p3
+    def _control_groups(self) -> npt.NDArray[np.int_]:
+        """
+        Índices dos pontos de controle de cada segmento da curva.
+        """
 
-            print(f"r1: {r1}, r4: {r4}")
+        return np.arange(0, len(self.control_points) - 3, 3)[:, None] + np.arange(4)
 
-            for t in arange(0, 1, 1 / self.points_per_segment):
-                # t2 = t * t
-                # t3 = t2 * t
+    def update_level_of_detail(self, view: "View", pixels_per_unit: float) -> bool:
+        if not self.level_of_detail:
+            return False
 
-                # h1 = 2 * t3 - 3 * t2 + 1
-                # h2 = -2 * t3 + 3 * t2
-                # h3 = t3 - 2 * t2 + t
-                # h4 = t3 - t2
+        wanted = screen_steps(view, self._control_array(), self._control_groups(), self.model_matrix, pixels_per_unit, self.pixels_per_step)
+        steps = choose_level_of_detail(self.points_per_segment, wanted, self.min_points_per_segment, self.max_points_per_segment)
+        if steps == self.points_per_segment:
+            return False
 
-                texp = 1 - t
-                texp2 = texp * texp
-                texp3 = texp2 * texp
-
-                h1 = texp3
-                h2 = 3 * texp2 * t
-                h3 = 3 * texp * t * t
-                h4 = t * t * t
+        self.points_per_segment = steps
+        self._bezier()
+        return True
 
-                px = h1 * p1.x + h2 * p2.x + h3 * p3.x + h4 * p4.x
-                py = h1 * p1.y + h2 * p2.y + h3 * p3.y + h4 * p4.y
-                pz = h1 * p1.z + h2 * p2.z + h3 * p3.z + h4 * p4.z
+    def _bezier(self) -> None:
+        # todos os segmentos cúbicos (cada um começa 3 pontos depois do anterior) numa única multiplicação.
+        control_points = self._control_array()
+        segments = control_points[self._control_groups()]
 
-                new_points.append(Vector3(px, py, pz))
+        points = np.matmul(bernstein_basis(self.points_per_segment), segments).reshape(-1, 4)
+        if len(segments):
+            # os passos vão de t = 0 até antes de t = 1; o fim da curva é o último ponto de controle.
+            points = np.vstack((points, segments[-1, -1]))
 
-        self.points = new_points
-        self.ppc_points = deepcopy(self.points)
-        print(f"BEZIER 2D: {self.points}")
+        points[:, 3] = 1
+        self.points = points
 
     def serialize(self, vertices: dict[Vector3, int], hex_to_color: dict[str, str]) -> str:
         raise NotImplementedError
 
     def process_clipped_points(
         self,
-        points: list[Vector3],
-        transformed_points: list[Vector3],
+        points: npt.NDArray[np.float64],
+        transformed_points: npt.NDArray[np.float64],
         window_min: Vector3,
         window_max: Vector3,
-    ) -> list[Vector3]:
+    ) -> npt.NDArray[np.float64]:
         return ignore_lines_in_window_border(points, transformed_points, window_min, window_max)
 
-    def draw(self, canvas: Canvas, points: list[Vector3]):
-        for p1, p2 in batched(points, 2):
-            canvas.create_line(p1.x, p1.y, p2.x, p2.y, width=3, fill=self.color, tags=self.id)
+    def simplify_clipped_points(self, points: npt.NDArray[np.float64], tolerance: float) -> npt.NDArray[np.float64]:
+        return simplify_segments(points, tolerance)
+
+    def draw(self, canvas: Canvas, points: npt.NDArray[np.float64]):
+        for polyline in polylines(points):
+            canvas.create_line(*polyline.ravel(), width=3, fill=self.color, tags=self.id)
@@ -1,22 +1,29 @@
 from tkinter import Canvas
 
-from clipping import CohenSutherland
+import numpy as np
+import numpy.typing as npt
+
+from clipping import SegmentClipper
 from vector3 import Vector3
 
 from .shape import Shape
+from .utils import simplify_segments
 
 
 class Line(Shape):
     shape_name: str = "Line"
-    clipper = CohenSutherland
+    clipper = SegmentClipper
 
     def draw(
         self,
         canvas: Canvas,
-        points: list[Vector3],
+        points: npt.NDArray[np.float64],
     ):
-        p1, p2 = points
-        canvas.create_line(p1.x, p1.y, p2.x, p2.y, fill=self.color, width=3, tags=self.id)
+        (x1, y1), (x2, y2) = points
+        canvas.create_line(x1, y1, x2, y2, fill=self.color, width=3, tags=self.id)
+
+    def simplify_clipped_points(self, points: npt.NDArray[np.float64], tolerance: float) -> npt.NDArray[np.float64]:
+        return simplify_segments(points, tolerance)
 
     def serialize(self, vertices: dict[Vector3, int], hex_to_color: dict[str, str]) -> str:
         return f"o {self.name}\nusemtl {hex_to_color[self.color]}\nl {vertices[self.p1]} {vertices[self.p2]}\n"
@@ -1,6 +1,9 @@
 from tkinter import Canvas
 from typing import Callable
 
+import numpy as np
+import numpy.typing as npt
+
 from clipping import PointClipper
 from vector3 import Vector3
 
@@ -15,8 +18,8 @@ class Point(Shape):
     def serialize(self, vertices: dict[Vector3, int], hex_to_color: dict[str, str]) -> str:
         return f"o {self.name}\nusemtl {hex_to_color[self.color]}\np {vertices[self.__point]}"
 
-    def draw(self, canvas: Canvas, point: list[Vector3]):
-        x, y, _ = point[0]
+    def draw(self, canvas: Canvas, point: npt.NDArray[np.float64]):
+        x, y = point[0]
         canvas.create_oval(
             x - self.radius,
             y - self.radius,
@@ -1,50 +1,180 @@
 from abc import ABC, abstractmethod
-from copy import deepcopy
+from itertools import product
 from tkinter import Canvas
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 from uuid import uuid4
 
+import numpy as np
+import numpy.typing as npt
+
 from clipping import Clipper
 from transformations import Transformer, Transformer3D
-from vector3 import Vector3
+from vector3 import Vector3, to_homogeneous
+
+if TYPE_CHECKING:
+    from projections import View
 
 
 class Shape(ABC):
     color: str
     name: str
     shape_name: str
-    points: list[Vector3]
-    ppc_points: list[Vector3]
+    _points: npt.NDArray[np.float64]
+    _centroid: Optional[npt.NDArray[np.float64]]
+    _local_bounds: Optional[tuple[npt.NDArray[np.float64], npt.NDArray[np.float64], npt.NDArray[np.float64], float]]
+    _world_bounds: Optional[tuple[npt.NDArray[np.float64], npt.NDArray[np.float64], npt.NDArray[np.float64], float]]
+    _model_matrix: npt.NDArray[np.float64]
+    ppc_points: npt.NDArray[np.float64]
+    # pares de índices em `points`, para shapes desenhados como segmentos que compartilham pontos. None: os pontos já são os pares.
+    edges: Optional[npt.NDArray[np.int_]]
     clipper: Clipper
-    transformer: Transformer
+    transformer: type[Transformer]
     dirty: bool
     id: str
 
-    def __init__(self, points: list[Vector3], name: Optional[str] = None, color: str = "red") -> None:
+    def __init__(self, points: list[Vector3] | npt.NDArray, name: Optional[str] = None, color: str = "red") -> None:
         self.color = color
         self.name = name if name else uuid4().hex
-        self.points = points
-        self.ppc_points = deepcopy(points)
+        # cópia: to_homogeneous devolve o próprio array quando ele já é (N, 4), e o shape não pode dividir os
+        # pontos com quem o criou (ex.: outro shape), senão o bake de um mexe no outro.
+        self.points = np.array(to_homogeneous(points), dtype=np.float64, copy=True)
+        self.ppc_points = np.empty_like(self.points)
+        self.model_matrix = np.identity(4)
+        self.edges = None
         self.dirty = True
 
         self.id = str(self)
 
-        self.transformer = Transformer3D(self.points)
-
     def __str__(self) -> str:
         return f"{self.shape_name}[{self.name}]"
 
+    @property
+    def points(self) -> npt.NDArray[np.float64]:
+        """
+        Os pontos do shape no seu próprio sistema de coordenadas, antes da model_matrix.
+        """
+
+        return self._points
+
+    @points.setter
+    def points(self, points: npt.NDArray[np.float64]):
+        self._points = points
+        self._centroid = None
+        self._local_bounds = None
+        self._world_bounds = None
+
+    @property
+    def model_matrix(self) -> npt.NDArray[np.float64]:
+        return self._model_matrix
+
+    @model_matrix.setter
+    def model_matrix(self, model_matrix: npt.NDArray[np.float64]):
+        self._model_matrix = model_matrix
+        self._world_bounds = None
+
+    def __bounds(self) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64], npt.NDArray[np.float64], float]:
+        """
+        AABB e esfera envolvente no mundo, recalculadas só quando os pontos ou a model_matrix mudam.
+        """
+
+        if self._local_bounds is None:
+            points = self.points[:, :3]
+            low, high = points.min(axis=0), points.max(axis=0)
+            center = (low + high) / 2
+            radius = float(np.sqrt(((points - center) ** 2).sum(axis=1).max()))
+            self._local_bounds = (low, high, center, radius)
+
+        if self._world_bounds is None:
+            low, high, center, radius = self._local_bounds
+            corners = np.matmul(to_homogeneous(product(*zip(low, high))), self.model_matrix)[:, :3]
+            center = np.matmul(np.append(center, 1), self.model_matrix)[:3]
+            # a esfera cresce com o maior fator de escala da model_matrix.
+            radius *= float(np.linalg.norm(self.model_matrix[:3, :3], 2))
+            self._world_bounds = (corners.min(axis=0), corners.max(axis=0), center, radius)
+
+        return self._world_bounds
+
+    @property
+    def bounding_box(self) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+        low, high, _, _ = self.__bounds()
+        return low, high
+
+    @property
+    def bounding_sphere(self) -> tuple[npt.NDArray[np.float64], float]:
+        _, _, center, radius = self.__bounds()
+        return center, radius
+
+    def ppc_buffer(self) -> npt.NDArray[np.float64]:
+        """
+        Buffer reutilizado entre quadros para a projeção. Só é realocado quando o número de pontos muda.
+        """
+
+        if self.ppc_points.shape != self.points.shape:
+            self.ppc_points = np.empty_like(self.points)
+
+        return self.ppc_points
+
+    @property
+    def world_points(self) -> npt.NDArray[np.float64]:
+        return np.matmul(self.points, self.model_matrix)
+
+    @property
+    def vectors(self) -> list[Vector3]:
+        """
+        Os pontos do shape no mundo como Vector3, para o código que trabalha com um ponto por vez.
+        """
+
+        return [Vector3.from_array(p) for p in self.world_points]
+
+    @property
+    def center(self) -> Vector3:
+        # transformações afins preservam o centróide, então basta transformar o centróide local.
+        if self._centroid is None:
+            self._centroid = self.points.mean(axis=0) if len(self.points) else np.array([0.0, 0.0, 0.0, 1.0])
+
+        return Vector3.from_array(np.matmul(self._centroid, self.model_matrix))
+
+    def transform(self, transformer: Transformer3D):
+        """
+        Acumula a transformação na model_matrix. Os pontos só são alterados em `bake`.
+        """
+
+        self.model_matrix = np.matmul(self.model_matrix, transformer.transformation_matrix)
+        self.dirty = True
+
+    def bake(self):
+        """
+        Aplica a model_matrix aos pontos e a reseta para a identidade.
+        """
+
+        self.points = self.world_points
+        self.model_matrix = np.identity(4)
+
+    def update_level_of_detail(self, view: "View", pixels_per_unit: float) -> bool:
+        """
+        Ajusta a tesselação ao tamanho do shape na tela. Retorna True se os pontos mudaram.
+        """
+
+        return False
+
     @abstractmethod
     def serialize(self, vertices: dict[Vector3, int], hex_to_color: dict[str, str]) -> str: ...
 
     @abstractmethod
-    def draw(self, canvas: Canvas, points: list[Vector3]): ...
+    def draw(self, canvas: Canvas, points: npt.NDArray[np.float64]): ...
 
     def process_clipped_points(
         self,
-        points: list[Vector3],
-        transformed_points: list[Vector3],
+        points: npt.NDArray[np.float64],
+        transformed_points: npt.NDArray[np.float64],
         window_min: Vector3,
         window_max: Vector3,
-    ) -> list[Vector3]:
+    ) -> npt.NDArray[np.float64]:
         return transformed_points
+
+    def simplify_clipped_points(self, points: npt.NDArray[np.float64], tolerance: float) -> npt.NDArray[np.float64]:
+        """
+        Remove pontos que não mudam o desenho, com até `tolerance` pixels de diferença. Por padrão não faz nada.
+        """
+
+        return points
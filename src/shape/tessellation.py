@@ -0,0 +1,218 @@
+"""
+Tesselação de curvas e patches bicúbicos em funções puras sobre arrays.
+
+As bases e os índices de arestas dependem só da resolução, então ficam em cache. As funções de patch
+recebem os arrays de vários patches e o número de passos, e devolvem a grade de pontos de cada um,
+(patches, steps * steps, 3); as linhas da superfície são as arestas dessas grades. `tessellate_patches`
+aplica uma delas a todos os patches, dividindo o trabalho entre processos quando há muitos patches.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from os import cpu_count
+from typing import Callable, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+# pontos de grade (patches * steps * steps) abaixo dos quais tesselar aqui, já vetorizado, custa menos do que
+# mandar os patches para outros processos. 100k pontos levam uns 20 ms (B-spline) ou 5 ms (Bézier) num núcleo;
+# a ida e volta pelo pool custa uns 4 ms mais cópias, fora a primeira chamada, que ainda cria os processos.
+PARALLEL_SAMPLES = 100_000
+
+BEZIER = np.array([[-1, 3, -3, 1], [3, -6, 3, 0], [-3, 3, 0, 0], [1, 0, 0, 0]], dtype=np.float64)
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+@cache
+def bernstein_basis(points_per_segment: int) -> npt.NDArray[np.float64]:
+    """
+    Base de Bernstein cúbica (amostras, 4) nos mesmos t de Curve2D: arange(0, 1, 1 / points_per_segment).
+    Fica em cache por resolução e é só leitura.
+    """
+
+    t = np.arange(0, 1, 1 / points_per_segment)[:, None]
+    basis = np.hstack(((1 - t) ** 3, 3 * (1 - t) ** 2 * t, 3 * (1 - t) * t**2, t**3))
+    basis.flags.writeable = False
+    return basis
+
+
+def points_per_patch(steps: int) -> int:
+    """
+    Número de pontos que um patch gera: uma grade steps x steps.
+    """
+
+    return steps * steps
+
+
+@cache
+def grid_edges(rows: int, columns: int) -> npt.NDArray[np.int_]:
+    """
+    Arestas (E, 2) de uma grade rows x columns guardada linha a linha: primeiro as horizontais, depois as verticais.
+    Fica em cache por tamanho e é só leitura.
+    """
+
+    index = np.arange(rows * columns).reshape(rows, columns)
+    horizontal = np.stack((index[:, :-1], index[:, 1:]), axis=2).reshape(-1, 2)
+    vertical = np.stack((index[:-1], index[1:]), axis=2).transpose(1, 0, 2).reshape(-1, 2)
+
+    edges = np.concatenate((horizontal, vertical))
+    edges.flags.writeable = False
+    return edges
+
+
+@cache
+def bezier_basis(steps: int) -> npt.NDArray[np.float64]:
+    """
+    S . M para `steps` valores de s em [0, 1], (steps, 4). Fica em cache por resolução e é só leitura.
+    """
+
+    parameters = np.linspace(0, 1, steps)
+    powers = np.stack((parameters**3, parameters**2, parameters, np.ones(steps)), axis=1)
+
+    basis = np.matmul(powers, BEZIER)
+    basis.flags.writeable = False
+    return basis
+
+
+def bezier_patch_grids(patches: npt.NDArray[np.float64], steps: int) -> npt.NDArray[np.float64]:
+    """
+    Todos os patches de Bézier bicúbicos (patches, 16, 3) de uma vez, numa grade steps x steps de (s, t).
+    Retorna (patches, steps * steps, 3), com grade[t, s] = S(s) . M . G . M^T . T(t)^T para cada coordenada.
+    """
+
+    basis = bezier_basis(steps)
+    grids = np.einsum("sa,pabk,tb->ptsk", basis, patches.reshape(-1, 4, 4, 3), basis, optimize=True)
+    return grids.reshape(len(patches), steps * steps, 3)
+
+
+def _mesh_basis(patches: int, steps: int) -> tuple[npt.NDArray[np.int_], npt.NDArray[np.float64]]:
+    # cada amostra da malha pertence a um único patch; a última de cada patch é a primeira do próximo.
+    samples = np.arange(patches * (steps - 1) + 1)
+    patch = np.minimum(samples // (steps - 1), patches - 1)
+    parameters = (samples - patch * (steps - 1)) / (steps - 1)
+    powers = np.stack((parameters**3, parameters**2, parameters, np.ones(len(samples))), axis=1)
+    return patch, np.matmul(powers, BEZIER)
+
+
+def bezier_mesh_grid(control_points: npt.NDArray[np.float64], steps: int) -> npt.NDArray[np.float64]:
+    """
+    Malha de patches de Bézier bicúbicos unidos com C0, dada por uma grade (3m + 1, 3n + 1, 3) de pontos de controle.
+    Retorna a grade (m * (steps - 1) + 1, n * (steps - 1) + 1, 3): as amostras das bordas entre patches são
+    avaliadas uma vez só, pelo patch de menor índice.
+    """
+
+    m, n = (len(control_points) - 1) // 3, (control_points.shape[1] - 1) // 3
+    window = np.arange(4)
+    rows = 3 * np.arange(m)[:, None] + window
+    columns = 3 * np.arange(n)[:, None] + window
+    # (m, n, 4, 4, 3): a geometria G de cada patch.
+    patches = control_points[rows[:, None, :, None], columns[None, :, None, :]]
+
+    row_patch, row_basis = _mesh_basis(m, steps)
+    column_patch, column_basis = _mesh_basis(n, steps)
+
+    # primeiro ao longo das linhas de controle, depois das colunas, escolhendo o patch de cada amostra.
+    partial = np.einsum("ra,rjabk->rjbk", row_basis, patches[row_patch])
+    return np.einsum("rcbk,cb->rck", partial[:, column_patch], column_basis)
+
+
+def bspline_patch_grids(deltas: npt.NDArray[np.float64], steps: int) -> npt.NDArray[np.float64]:
+    """
+    Patches avaliados por diferenças adiantadas a partir das matrizes E . C . E^T de cada coordenada (patches, 3, 4, 4).
+    Retorna (patches, steps * steps, 3): as duas famílias de curvas de um patch passam pelos mesmos pontos da grade.
+    """
+
+    # cada passo soma a próxima diferença em todas as linhas ao mesmo tempo (o numpy copia quando os lados se sobrepõem).
+    delta = deltas.copy()
+    starts = np.empty(deltas.shape[:2] + (steps, 4))
+    for k in range(steps):
+        starts[:, :, k] = delta[:, :, 0]
+        delta[:, :, :3] += delta[:, :, 1:]
+
+    # os pontos de partida de todas as curvas de todos os patches avançam juntos.
+    grids = np.empty(deltas.shape[:2] + (steps, steps))
+    for i in range(steps):
+        grids[..., i] = starts[..., 0]
+        starts[..., :3] += starts[..., 1:]
+
+    return grids.transpose(0, 2, 3, 1).reshape(len(deltas), steps * steps, 3)
+
+
+def patch_edges(patches: int, steps: int) -> npt.NDArray[np.int_]:
+    """
+    Arestas (E, 2) das grades steps x steps de `patches` patches guardadas uma depois da outra.
+    """
+
+    return (np.arange(patches)[:, None, None] * steps * steps + grid_edges(steps, steps)).reshape(-1, 2)
+
+
+def _tessellate_chunk(
+    function: Callable[[npt.NDArray[np.float64], int], npt.NDArray[np.float64]],
+    patches: npt.NDArray[np.float64],
+    steps: int,
+    memory_name: str,
+    total: int,
+    offset: int,
+):
+    # roda em outro processo: escreve os pontos direto na memória compartilhada.
+    memory = SharedMemory(name=memory_name)
+    try:
+        out = np.ndarray((total, 3), dtype=np.float64, buffer=memory.buf)
+        out[offset : offset + len(patches) * points_per_patch(steps)] = function(patches, steps).reshape(-1, 3)
+        del out
+    finally:
+        memory.close()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # spawn: o processo principal tem threads (Tk e o RenderWorker), e fork com threads não é seguro.
+        _executor = ProcessPoolExecutor(mp_context=get_context("spawn"))
+
+    return _executor
+
+
+def tessellate_patches(
+    function: Callable[[npt.NDArray[np.float64], int], npt.NDArray[np.float64]],
+    patches: npt.NDArray[np.float64],
+    steps: int,
+    parallel: Optional[bool] = None,
+) -> npt.NDArray[np.float64]:
+    """
+    Aplica `function` aos patches e junta as grades, (patches * steps * steps, 3), na ordem dos patches.
+    Com muitos patches, eles são divididos em blocos entre os processos de um ProcessPoolExecutor, que escrevem
+    o resultado num bloco de SharedMemory, sem passar os arrays de volta pelo pickle.
+    """
+
+    if parallel is None:
+        parallel = len(patches) * points_per_patch(steps) >= PARALLEL_SAMPLES and (cpu_count() or 1) > 1
+
+    if not len(patches):
+        return np.empty((0, 3))
+
+    if not parallel:
+        return function(patches, steps).reshape(-1, 3)
+
+    size = points_per_patch(steps)
+    total = len(patches) * size
+    memory = SharedMemory(create=True, size=total * 3 * np.dtype(np.float64).itemsize)
+    try:
+        executor = _get_executor()
+        chunks = np.array_split(np.arange(len(patches)), min(len(patches), (cpu_count() or 1) * 4))
+        futures = [
+            executor.submit(_tessellate_chunk, function, patches[chunk], steps, memory.name, total, int(chunk[0]) * size)
+            for chunk in chunks
+            if len(chunk)
+        ]
+        for future in futures:
+            future.result()
+
+        return np.ndarray((total, 3), dtype=np.float64, buffer=memory.buf).copy()
+    finally:
+        memory.close()
+        memory.unlink()
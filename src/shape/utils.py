@@ -1,20 +1,28 @@
-from vector3 import Vector3
+from typing import TYPE_CHECKING
+
+import numpy as np
+import numpy.typing as npt
+
+from vector3 import Vector3, to_homogeneous
+
+if TYPE_CHECKING:
+    from projections import View
 
 
 def ignore_lines_in_window_border(
-    points: list[Vector3],
-    transformed_points: list[Vector3],
+    points: npt.NDArray[np.float64],
+    transformed_points: npt.NDArray[np.float64],
     window_min: Vector3,
     window_max: Vector3,
-) -> list[Vector3]:
+) -> npt.NDArray[np.float64]:
     returned_points = []
     for i in range(len(points) - 1):
         p1_in_window_border = False
         p2_in_window_border = False
         same_border = False
 
-        p1x, p1y = points[i].x, points[i].y
-        p2x, p2y = points[i + 1].x, points[i + 1].y
+        p1x, p1y = points[i][:2]
+        p2x, p2y = points[i + 1][:2]
 
         for limit in (window_max, window_min):
             wx, wy = limit.x, limit.y
@@ -32,4 +40,134 @@ def ignore_lines_in_window_border(
         returned_points.append(transformed_points[i])
         returned_points.append(transformed_points[i + 1])
 
-    return returned_points
+    return np.array(returned_points).reshape(-1, transformed_points.shape[1])
+
+
+def polylines(segments: npt.NDArray[np.float64], tolerance: float = 1e-6) -> list[npt.NDArray[np.float64]]:
+    """
+    Junta segmentos (pares de pontos consecutivos) conectados em polilinhas.
+    Onde o fim de um segmento não coincide com o início do próximo (ex.: um trecho recortado), começa outra polilinha.
+    """
+
+    if not len(segments):
+        return []
+
+    starts = segments[0::2]
+    ends = segments[1::2]
+    breaks = np.flatnonzero(np.any(np.abs(ends[:-1] - starts[1:]) > tolerance, axis=1)) + 1
+
+    runs = []
+    for first, last in zip(np.concatenate(([0], breaks)), np.concatenate((breaks, [len(starts)]))):
+        runs.append(np.concatenate((starts[first:last], ends[last - 1 : last])))
+
+    return runs
+
+
+def screen_steps(
+    view: "View",
+    control_points: npt.NDArray[np.float64],
+    groups: npt.NDArray[np.int_],
+    model_matrix: npt.NDArray[np.float64],
+    pixels_per_unit: float,
+    pixels_per_step: float,
+) -> int:
+    """
+    Quantos passos de tesselação cada trecho precisa para que um passo cubra uns `pixels_per_step` pixels.
+
+    `groups` tem, em cada linha, os índices dos pontos de controle de um trecho (um segmento da curva
+    ou um patch da superfície). O tamanho do trecho na tela é a diagonal da caixa dos seus pontos de
+    controle projetados, e vale o maior trecho.
+    """
+
+    if not len(groups):
+        return 0
+
+    projected = view.project(control_points, model_matrix)[:, :2][groups]
+    size = np.linalg.norm(projected.max(axis=1) - projected.min(axis=1), axis=1).max()
+    return int(np.ceil(size * pixels_per_unit / pixels_per_step))
+
+
+def choose_level_of_detail(current: int, wanted: int, min_steps: int, max_steps: int, hysteresis: float = 1.5) -> int:
+    """
+    Só troca o nível de detalhe quando o desejado sai da faixa [current / hysteresis, current * hysteresis],
+    para não retesselar a cada pequena mudança de zoom.
+    """
+
+    wanted = min(max(wanted, min_steps), max_steps)
+    if current / hysteresis <= wanted <= current * hysteresis:
+        return current
+
+    return wanted
+
+
+def bake_control_points(control_points: list, model_matrix: npt.NDArray[np.float64]) -> list:
+    """
+    Aplica a model_matrix aos pontos de controle, mantendo a forma da lista (pontos ou grade de pontos).
+    """
+
+    if control_points and isinstance(control_points[0], list):
+        return [bake_control_points(line, model_matrix) for line in control_points]
+
+    if not control_points:
+        return control_points
+
+    return [Vector3.from_array(point) for point in np.matmul(to_homogeneous(control_points), model_matrix)]
+
+
+def simplify_segments(segments: npt.NDArray[np.float64], tolerance: float) -> npt.NDArray[np.float64]:
+    """
+    Simplifica segmentos (pares de pontos consecutivos) já em coordenadas do canvas, sem mudança visível:
+
+    1. os pontos são arredondados para uma grade de `tolerance` pixels;
+    2. segmentos que viraram um ponto só, ou que repetem outro segmento, são descartados;
+    3. segmentos conectados e quase colineares são unidos (ver `_merge_collinear`).
+    """
+
+    if tolerance <= 0 or not len(segments):
+        return segments
+
+    pairs = (np.round(segments / tolerance) * tolerance).reshape(-1, 2, 2)
+    pairs = pairs[np.any(pairs[:, 0] != pairs[:, 1], axis=1)]
+
+    # o mesmo segmento nos dois sentidos também é repetido.
+    ordered = np.where((pairs[:, 0, 0] <= pairs[:, 1, 0])[:, None, None], pairs, pairs[:, ::-1])
+    _, first = np.unique(ordered.reshape(-1, 4), axis=0, return_index=True)
+    pairs = pairs[np.sort(first)]
+
+    # cada passada desvia no máximo metade do que sobrou da tolerância, então o desvio total fica abaixo dela.
+    for step in range(1, 5):
+        merged = _merge_collinear(pairs, tolerance / 2**step)
+        if len(merged) == len(pairs):
+            break
+        pairs = merged
+
+    return pairs.reshape(-1, 2)
+
+
+def _merge_collinear(pairs: npt.NDArray[np.float64], tolerance: float) -> npt.NDArray[np.float64]:
+    """
+    Une dois segmentos conectados quando o ponto do meio está a menos de `tolerance` da reta entre as pontas.
+    Pontos do meio vizinhos nunca são removidos na mesma passada, então o erro não se acumula.
+    """
+
+    if len(pairs) < 2:
+        return pairs
+
+    start, middle, end = pairs[:-1, 0], pairs[:-1, 1], pairs[1:, 1]
+    connected = np.all(middle == pairs[1:, 0], axis=1)
+
+    direction = end - start
+    length = np.linalg.norm(direction, axis=1)
+    offset = middle - start
+    distance = np.abs(direction[:, 0] * offset[:, 1] - direction[:, 1] * offset[:, 0]) / np.where(length > 0, length, 1)
+    candidate = connected & (length > 0) & (distance < tolerance)
+
+    # de cada sequência de candidatos vizinhos, só os de posição par dentro da sequência são removidos.
+    index = np.arange(len(candidate))
+    run_start = candidate & ~np.concatenate(([False], candidate[:-1]))
+    first_of_run = np.maximum.accumulate(np.where(run_start, index, 0))
+    merge = candidate & ((index - first_of_run) % 2 == 0)
+
+    merged = pairs.copy()
+    merged[:-1][merge, 1] = pairs[1:][merge, 1]
+    return merged[~np.concatenate(([False], merge))]
@@ -1,10 +1,13 @@
 from tkinter import Canvas
 
-from clipping import SutherlandHodgman
+import numpy as np
+import numpy.typing as npt
+
+from clipping import SegmentClipper, SutherlandHodgman
 from vector3 import Vector3
 
 from .shape import Shape
-from .utils import ignore_lines_in_window_border
+from .utils import polylines, simplify_segments
 
 
 class Wireframe(Shape):
@@ -22,33 +25,47 @@ class Wireframe(Shape):
         self.fill = fill
         super().__init__(points, name, color)
 
+        if not fill:
+            # o contorno sem preenchimento é recortado aresta por aresta. O Sutherland-Hodgman fecharia o
+            # polígono pela borda da window, e esses trechos apareceriam como arestas do shape.
+            self.clipper = SegmentClipper
+            self.edges = self._outline_edges()
+
+    def _outline_edges(self) -> npt.NDArray[np.int_] | None:
+        """
+        Arestas do contorno fechado: cada ponto com o seguinte, e o último com o primeiro.
+        """
+
+        index = np.arange(len(self.points))
+        return np.stack((index, np.roll(index, -1)), axis=1)
+
     def serialize(self, vertices: dict[Vector3, int], hex_to_color: dict[str, str]) -> str:
-        return f"o {self.name}\nusemtl {hex_to_color[self.color]}\nf {' '.join([vertices[p] for p in self.points])}"
+        return f"o {self.name}\nusemtl {hex_to_color[self.color]}\nf {' '.join([vertices[p] for p in self.vectors])}"
 
     def process_clipped_points(
         self,
-        points: list[Vector3],
-        transformed_points: list[Vector3],
+        points: npt.NDArray[np.float64],
+        transformed_points: npt.NDArray[np.float64],
         window_min: Vector3,
         window_max: Vector3,
-    ) -> list[Vector3]:
-        if self.fill or not len(transformed_points):
-            return transformed_points
+    ) -> npt.NDArray[np.float64]:
+        # sem preenchimento, o recorte por segmentos não cria trechos na borda da window.
+        return transformed_points
+
+    def simplify_clipped_points(self, points: npt.NDArray[np.float64], tolerance: float) -> npt.NDArray[np.float64]:
+        if self.fill:
+            return points
 
-        points.append(points[0])
-        transformed_points.append(transformed_points[0])
-        return ignore_lines_in_window_border(points, transformed_points, window_min, window_max)
+        return simplify_segments(points, tolerance)
 
-    def draw(self, canvas: Canvas, points: list[Vector3]):
+    def draw(self, canvas: Canvas, points: npt.NDArray[np.float64]):
         if self.fill:
             canvas.create_polygon(
-                *[(p.x, p.y) for p in points],
+                *[(x, y) for x, y in points],
                 fill=self.color,
                 tags=self.id
             )
         else:
-            new_points = []
-            for i in range(0, len(points), 2):
-                new_points.append((points[i], points[i + 1]))
-            for p1, p2 in new_points:
-                canvas.create_line(p1.x, p1.y, p2.x, p2.y, width=3, fill=self.color, tags=self.id)
+            # os segmentos recortados que continuam uns nos outros vão num item só.
+            for polyline in polylines(points):
+                canvas.create_line(*polyline.ravel(), width=3, fill=self.color, tags=self.id)
@@ -2,16 +2,22 @@ from itertools import batched
 from tkinter import Canvas
 from typing import Optional
 
+import numpy as np
+import numpy.typing as npt
+
+from clipping import SegmentClipper
 from transformations import Transformer3D
 from vector3 import Vector3
 
 from .shape import Shape
+from .utils import polylines, simplify_segments
 from .wireframe import Wireframe
 
 
 class Wireframe3D(Wireframe):
     shape_name = "Object3D"
     transformer = Transformer3D
+    clipper = SegmentClipper
 
     lines: list[tuple[Vector3, Vector3]]
 
@@ -21,16 +27,24 @@ class Wireframe3D(Wireframe):
         print(f"{points=}")
         super().__init__(points, False, name, color)
 
+    def _outline_edges(self) -> None:
+        # os pontos já são os pares de pontos de cada linha.
+        return None
+
     def serialize(self, vertices: dict[Vector3, int], hex_to_color: dict[str, str]) -> str: ...
 
     def process_clipped_points(
-        self, points: list[Vector3], transformed_points: list[Vector3], window_min: Vector3, window_max: Vector3
-    ) -> list[Vector3]:
+        self,
+        points: npt.NDArray[np.float64],
+        transformed_points: npt.NDArray[np.float64],
+        window_min: Vector3,
+        window_max: Vector3,
+    ) -> npt.NDArray[np.float64]:
         return transformed_points
 
-    def draw(self, canvas: Canvas, points: list[Vector3]):
-        for i in range(0, len(points), 2):
-            p1, p2 = points[i], points[i + 1]
-            x1, y1, _ = p1
-            x2, y2, _ = p2
-            canvas.create_line(x1, y1, x2, y2, fill=self.color, tags=self.id)
+    def simplify_clipped_points(self, points: npt.NDArray[np.float64], tolerance: float) -> npt.NDArray[np.float64]:
+        return simplify_segments(points, tolerance)
+
+    def draw(self, canvas: Canvas, points: npt.NDArray[np.float64]):
+        for polyline in polylines(points):
+            canvas.create_line(*polyline.ravel(), fill=self.color, tags=self.id)
@@ -5,12 +5,19 @@ from typing import Literal, Optional, Self
 import numpy as np
 import numpy.typing as npt
 
-from vector3 import Vector3
+from vector3 import Vector3, to_homogeneous
+
+
+def _write_back(points: list[Vector3], transformed: npt.NDArray) -> None:
+    for point, (x, y, z) in zip(points, transformed[:, :3].tolist()):
+        point.x = round(x, 6)
+        point.y = round(y, 6)
+        point.z = round(z, 6)
 
 
 class Transformer(ABC):
     transformation_matrix: npt.NDArray
-    points: list[Vector3]
+    points: list[Vector3] | npt.NDArray
 
     @abstractmethod
     def rotate(self, degree: float, point: Vector3) -> Self: ...
@@ -19,9 +26,12 @@ class Transformer(ABC):
     def translation(self, d: Vector3, inverse: bool = False) -> Self: ...
 
     @abstractmethod
-    def scale(self, factor: float) -> Self: ...
+    def scale(self, factor: float, center: Optional[Vector3] = None) -> Self: ...
+
+    def center(self, points: list[Vector3] | npt.NDArray) -> Vector3:
+        if isinstance(points, np.ndarray):
+            return Vector3.from_array(points[:, :3].mean(axis=0))
 
-    def center(self, points: list[Vector3]) -> Vector3:
         n = len(points)
         cx = sum(point.x for point in points) / n
         cy = sum(point.y for point in points) / n
@@ -34,8 +44,8 @@ class Transformer(ABC):
 
 
 class Transformer2D(Transformer):
-    def __init__(self, points: Optional[list[Vector3]] = None) -> None:
-        self.points = points or []
+    def __init__(self, points: Optional[list[Vector3] | npt.NDArray] = None) -> None:
+        self.points = points if points is not None else []
 
         # matriz identidade. A x I = A
         self.transformation_matrix = [[1, 0, 0], [0, 1, 0], [0, 0, 1]]
@@ -60,8 +70,8 @@ class Transformer2D(Transformer):
         self.transformation_matrix = np.matmul(self.transformation_matrix, matrix)
         return self
 
-    def scale(self, factor: float) -> Self:
-        c = self.center(self.points)
+    def scale(self, factor: float, center: Optional[Vector3] = None) -> Self:
+        c = center if center is not None else self.center(self.points)
 
         self.translation(-c)
         matrix = np.array([[factor, 0, 0], [0, factor, 0], [0, 0, 1]])
@@ -70,16 +80,16 @@ class Transformer2D(Transformer):
         return self
 
     def apply(self):
-        for i, point in enumerate(self.points):
-            arr = [round(x, 6) for x in point]
+        if isinstance(self.points, np.ndarray):
+            # as colunas x, y, z são tratadas como coordenadas homogêneas 2D.
+            self.points[:, :3] = np.matmul(self.points[:, :3], self.transformation_matrix)
+            return
 
-            #print(f"BEFORE: {self.points[i]=}")
-            vec = Vector3.from_array(np.matmul(arr, self.transformation_matrix))
+        if not self.points:
+            return
 
-            self.points[i].x = vec.x
-            self.points[i].y = vec.y
-            self.points[i].z = vec.z
-            #print(f"AFTER: {self.points[i]=}")
+        transformed = np.matmul(to_homogeneous(self.points)[:, :3], self.transformation_matrix)
+        _write_back(self.points, transformed)
 
 
 class Transformer3D(Transformer):
@@ -118,8 +128,8 @@ class Transformer3D(Transformer):
                 )
         return matrix_r
 
-    def __init__(self, points: Optional[list[Vector3]] = None) -> None:
-        self.points = points or []
+    def __init__(self, points: Optional[list[Vector3] | npt.NDArray] = None) -> None:
+        self.points = points if points is not None else []
 
         # matriz identidade. A x I = A
         self.transformation_matrix = [[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]]
@@ -174,8 +184,8 @@ class Transformer3D(Transformer):
         self.transformation_matrix = np.matmul(self.transformation_matrix, matrix)
         return self
 
-    def scale(self, factor: float) -> Self:
-        c = self.center(self.points)
+    def scale(self, factor: float, center: Optional[Vector3] = None) -> Self:
+        c = center if center is not None else self.center(self.points)
 
         self.translation(-c)
 
@@ -186,12 +196,9 @@ class Transformer3D(Transformer):
         return self
 
     def apply(self) -> None:
-        for i, p in enumerate(self.points):
-            arr = [round(x, 6) for x in list(p) + [1]]
-            vec = Vector3.from_array(np.matmul(np.array(arr), self.transformation_matrix))
-
-            self.points[i].x = vec.x
-            self.points[i].y = vec.y
-            self.points[i].z = vec.z
+        if isinstance(self.points, np.ndarray):
+            self.points[:] = np.matmul(self.points, self.transformation_matrix)
+        elif self.points:
+            _write_back(self.points, np.matmul(to_homogeneous(self.points), self.transformation_matrix))
 
         self.transformation_matrix = [[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]]
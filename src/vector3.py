@@ -1,4 +1,4 @@
-from typing import Union
+from typing import Iterable, Union
 
 import numpy as np
 import numpy.typing as npt
@@ -135,3 +135,19 @@ class Vector3:
         if isinstance(other, Vector3):
             return (self.x, self.y, self.z) >= (other.x, other.y, other.z)
         return (self.x, self.y, self.z) >= other
+
+
+def to_homogeneous(points: Iterable[Vector3] | npt.NDArray) -> npt.NDArray[np.float64]:
+    """
+    Empilha os pontos em uma matriz (N, 4) de coordenadas homogêneas, com w = 1.
+    """
+
+    if isinstance(points, np.ndarray) and points.ndim == 2 and points.shape[1] == 4:
+        return np.ascontiguousarray(points, dtype=np.float64)
+
+    points = list(points)
+    arr = np.ones((len(points), 4), dtype=np.float64)
+    if points:
+        arr[:, :3] = [(p[0], p[1], p[2]) for p in points]
+
+    return arr
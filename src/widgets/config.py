@@ -20,6 +20,10 @@ class Configuration:
     animate_window_rotation: StringVar
     __clipping_algorithm: StringVar
     __selected_shape_center: StringVar
+    __backend: StringVar
+    __max_fps: StringVar
+    __animation_fps: StringVar
+    __simplify_tolerance: StringVar
 
     def __init__(
         self,
@@ -135,6 +139,8 @@ class Configuration:
         ttk.Checkbutton(
             self.frame, text="Animate Window Rotation", variable=self.animate_window_rotation, onvalue="on", offvalue="off"
         ).grid(row=22, column=0, pady=3, sticky="W")
+        self.__animation_fps = StringVar(value="")
+        ttk.Label(self.frame, textvariable=self.__animation_fps).grid(row=22, column=1, pady=3, sticky="W")
         ttk.Label(
             self.frame, text="Warning! Tkinter is slow, so this will eventually burn your CPU!", foreground="red", font=Font(size=9)
         ).grid(row=23, column=0, pady=3, sticky="W")
@@ -156,6 +162,35 @@ class Configuration:
             variable=self.__projection,
             command=lambda: self.frame.event_generate(Events.CHANGE_PROJECTION, data="perspective"),
         ).grid(column=0, row=27, pady=3, sticky="W")
+
+        ttk.Separator(self.frame, orient="horizontal").grid(row=28, column=0, ipadx=200, columnspan=2, pady=(20, 20))
+        self.__backend = StringVar(value="canvas")
+        ttk.Label(self.frame, text="Rendering").grid(row=29, column=0, pady=3, sticky="W")
+        ttk.Radiobutton(
+            self.frame,
+            text="Canvas items",
+            value="canvas",
+            variable=self.__backend,
+            command=lambda: self.frame.event_generate(Events.CHANGE_BACKEND, data="canvas"),
+        ).grid(column=0, row=30, pady=3, sticky="W")
+        ttk.Radiobutton(
+            self.frame,
+            text="Raster (NumPy)",
+            value="raster",
+            variable=self.__backend,
+            command=lambda: self.frame.event_generate(Events.CHANGE_BACKEND, data="raster"),
+        ).grid(column=0, row=31, pady=3, sticky="W")
+
+        self.__max_fps = StringVar(value="0")
+        ttk.Label(self.frame, text="Max FPS (0 = no limit): ").grid(column=0, row=32, pady=3, sticky="W")
+        ttk.Entry(self.frame, textvariable=self.__max_fps).grid(column=1, row=32, pady=3, sticky="W")
+
+        self.__simplify_tolerance = StringVar(value="0")
+        ttk.Label(self.frame, text="Simplify (px, 0 = off): ").grid(column=0, row=33, pady=3, sticky="W")
+        ttk.Entry(self.frame, textvariable=self.__simplify_tolerance).grid(column=1, row=33, pady=3, sticky="W")
+        # a tolerância muda o desenho de todos os shapes, então cada edição pede um quadro novo.
+        self.__simplify_tolerance.trace_add("write", lambda *_: self.frame.event_generate(Events.CHANGE_SIMPLIFY_TOLERANCE))
+
     @property
     def rotation_axis(self) -> Vector3:
         axis = self.__rotation_axis.get().strip()[1:-1]  # ignora () e []
@@ -174,6 +209,23 @@ class Configuration:
     def zoom_step(self) -> float:
         return float(self.__zoom_step.get())
 
+    @property
+    def max_fps(self) -> float | None:
+        # lido a cada redesenho, então um valor inválido (ex.: no meio da digitação) só desliga o limite.
+        try:
+            fps = float(self.__max_fps.get())
+        except ValueError:
+            return None
+
+        return fps if fps > 0 else None
+
+    @property
+    def simplify_tolerance(self) -> float:
+        try:
+            return max(float(self.__simplify_tolerance.get()), 0.0)
+        except ValueError:
+            return 0.0
+
     @property
     def rotation_rad(self) -> float:
         return radians(float(self.__rotation_degree.get()))
@@ -189,3 +241,19 @@ class Configuration:
             self.__selected_shape_center.set("None")
         else:
             self.__selected_shape_center.set(str(tuple(round(float(x), 2) for x in new_value)))
+
+    @property
+    def animation_fps(self) -> str:
+        return self.__animation_fps.get()
+
+    @animation_fps.setter
+    def animation_fps(self, fps: tuple[float, float] | None):
+        """
+        FPS alcançado e alvo da animação, ou None para esconder.
+        """
+
+        if fps is None:
+            self.__animation_fps.set("")
+        else:
+            achieved, target = fps
+            self.__animation_fps.set(f"{achieved:.1f} / {target:.0f} FPS")